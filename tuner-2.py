@@ -42,10 +42,14 @@ import numpy as np    # NumPy is used for efficient numerical operations on larg
 import json           # Used for saving and loading configuration.
 import sounddevice as sd   # Use sounddevice for audio I/O.
 import time
+import functools      # Used to cache per-frame-size FFT setup.
+import threading      # Used for writing the config file off the GUI thread.
+import ctypes         # Used to request realtime scheduling (MMCSS) for the audio worker on Windows.
+from collections import deque
 
 # PySide6 imports:
-from PySide6.QtCore import Qt, QThread, Signal, QTimer, QMutex, QWaitCondition
-from PySide6.QtGui import QPainter, QPen, QColor, QFont, QFontMetrics, QIcon, QTextCursor, QPainterPath, QKeySequence, QShortcut
+from PySide6.QtCore import Qt, QThread, Signal, SIGNAL, QTimer, QElapsedTimer, QMutex, QWaitCondition, QPointF, QLine
+from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QFont, QFontMetrics, QIcon, QTextCursor, QPainterPath, QTransform, QKeySequence, QShortcut, QPixmap, QStaticText
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QPushButton, QFrame,
                                QSlider, QLabel, QHBoxLayout, QVBoxLayout, QComboBox,
                                QCheckBox, QMessageBox, QTextEdit, QToolTip)
@@ -55,44 +59,48 @@ from PySide6.QtOpenGLWidgets import QOpenGLWidget
 # --------------------------- Music Theory Constants ---------------------------
 
 # Chromatic note name arrays (used for non-scale-context pitch display)
-SHARP_LETTER_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-FLAT_LETTER_NAMES  = ['C', 'D♭', 'D', 'E♭', 'E', 'F', 'G♭', 'G', 'A♭', 'A', 'B♭', 'B']
-SHARP_SOLFEGE_NAMES = ['Do', 'Do#', 'Re', 'Re#', 'Mi', 'Fa', 'Fa#', 'Sol', 'Sol#', 'La', 'La#', 'Si']
-FLAT_SOLFEGE_NAMES = ['Do', 'Re♭', 'Re', 'Mi♭', 'Mi', 'Fa', 'Sol♭', 'Sol', 'La♭', 'La', 'Si♭', 'Si']
+SHARP_LETTER_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+FLAT_LETTER_NAMES  = ('C', 'D♭', 'D', 'E♭', 'E', 'F', 'G♭', 'G', 'A♭', 'A', 'B♭', 'B')
+SHARP_SOLFEGE_NAMES = ('Do', 'Do#', 'Re', 'Re#', 'Mi', 'Fa', 'Fa#', 'Sol', 'Sol#', 'La', 'La#', 'Si')
+FLAT_SOLFEGE_NAMES = ('Do', 'Re♭', 'Re', 'Mi♭', 'Mi', 'Fa', 'Sol♭', 'Sol', 'La♭', 'La', 'Si♭', 'Si')
+
+# Note name -> pitch class (C=0), for both sharp and flat spellings
+NAME_TO_PC = {n: i for i, n in enumerate(SHARP_LETTER_NAMES)}
+NAME_TO_PC.update({n: i for i, n in enumerate(FLAT_LETTER_NAMES)})
 
 # Correctly spelled major scales for all 12 keys (circle of fifths)
 MAJOR_SCALES = {
-    "C":  ["C", "D", "E", "F", "G", "A", "B"],
-    "G":  ["G", "A", "B", "C", "D", "E", "F#"],
-    "D":  ["D", "E", "F#", "G", "A", "B", "C#"],
-    "A":  ["A", "B", "C#", "D", "E", "F#", "G#"],
-    "E":  ["E", "F#", "G#", "A", "B", "C#", "D#"],
-    "B":  ["B", "C#", "D#", "E", "F#", "G#", "A#"],
-    "F#": ["F#", "G#", "A#", "B", "C#", "D#", "E#"],
-    "F":  ["F", "G", "A", "B♭", "C", "D", "E"],
-    "B♭": ["B♭", "C", "D", "E♭", "F", "G", "A"],
-    "E♭": ["E♭", "F", "G", "A♭", "B♭", "C", "D"],
-    "A♭": ["A♭", "B♭", "C", "D♭", "E♭", "F", "G"],
-    "D♭": ["D♭", "E♭", "F", "G♭", "A♭", "B♭", "C"],
-    "G♭": ["G♭", "A♭", "B♭", "C♭", "D♭", "E♭", "F"],
+    "C":  ("C", "D", "E", "F", "G", "A", "B"),
+    "G":  ("G", "A", "B", "C", "D", "E", "F#"),
+    "D":  ("D", "E", "F#", "G", "A", "B", "C#"),
+    "A":  ("A", "B", "C#", "D", "E", "F#", "G#"),
+    "E":  ("E", "F#", "G#", "A", "B", "C#", "D#"),
+    "B":  ("B", "C#", "D#", "E", "F#", "G#", "A#"),
+    "F#": ("F#", "G#", "A#", "B", "C#", "D#", "E#"),
+    "F":  ("F", "G", "A", "B♭", "C", "D", "E"),
+    "B♭": ("B♭", "C", "D", "E♭", "F", "G", "A"),
+    "E♭": ("E♭", "F", "G", "A♭", "B♭", "C", "D"),
+    "A♭": ("A♭", "B♭", "C", "D♭", "E♭", "F", "G"),
+    "D♭": ("D♭", "E♭", "F", "G♭", "A♭", "B♭", "C"),
+    "G♭": ("G♭", "A♭", "B♭", "C♭", "D♭", "E♭", "F"),
 }
 
 # Correctly spelled natural minor scales for all 12 keys
 NATURAL_MINOR_SCALES = {
-    "A":  ["A", "B", "C", "D", "E", "F", "G"],
-    "E":  ["E", "F#", "G", "A", "B", "C", "D"],
-    "B":  ["B", "C#", "D", "E", "F#", "G", "A"],
-    "F#": ["F#", "G#", "A", "B", "C#", "D", "E"],
-    "C#": ["C#", "D#", "E", "F#", "G#", "A", "B"],
-    "G#": ["G#", "A#", "B", "C#", "D#", "E", "F#"],
-    "D":  ["D", "E", "F", "G", "A", "B♭", "C"],
-    "G":  ["G", "A", "B♭", "C", "D", "E♭", "F"],
-    "C":  ["C", "D", "E♭", "F", "G", "A♭", "B♭"],
-    "F":  ["F", "G", "A♭", "B♭", "C", "D♭", "E♭"],
-    "B♭": ["B♭", "C", "D♭", "E♭", "F", "G♭", "A♭"],
-    "E♭": ["E♭", "F", "G♭", "A♭", "B♭", "C♭", "D♭"],
+    "A":  ("A", "B", "C", "D", "E", "F", "G"),
+    "E":  ("E", "F#", "G", "A", "B", "C", "D"),
+    "B":  ("B", "C#", "D", "E", "F#", "G", "A"),
+    "F#": ("F#", "G#", "A", "B", "C#", "D", "E"),
+    "C#": ("C#", "D#", "E", "F#", "G#", "A", "B"),
+    "G#": ("G#", "A#", "B", "C#", "D#", "E", "F#"),
+    "D":  ("D", "E", "F", "G", "A", "B♭", "C"),
+    "G":  ("G", "A", "B♭", "C", "D", "E♭", "F"),
+    "C":  ("C", "D", "E♭", "F", "G", "A♭", "B♭"),
+    "F":  ("F", "G", "A♭", "B♭", "C", "D♭", "E♭"),
+    "B♭": ("B♭", "C", "D♭", "E♭", "F", "G♭", "A♭"),
+    "E♭": ("E♭", "F", "G♭", "A♭", "B♭", "C♭", "D♭"),
     # A♭ natural minor (enharmonic alt for G# when harmonic/melodic would need ##)
-    "A♭": ["A♭", "B♭", "C♭", "D♭", "E♭", "F♭", "G♭"],
+    "A♭": ("A♭", "B♭", "C♭", "D♭", "E♭", "F♭", "G♭"),
 }
 
 # Map composite root notes to preferred enharmonic for major keys
@@ -139,6 +147,7 @@ class Defaults:
         LoadConfigFromFile() - Load configuration from a file.
         SaveConfigToFile() - Save current configuration to a file.
         updateWindowGeometry(window) - Update window geometry in the defaults based on the given window.
+        rebuild_scale_cache() - Rebuild the scale membership/spelling lookup tables.
     """
     def InitDefaults(self):
         # Enable debug logging (if True, a debug log text box will be shown in the GUI)
@@ -151,6 +160,10 @@ class Defaults:
         self.DEFAULT_WINDOW_POS_Y = 350          # Initial Y position of the window.
         self.WINDOW_OFFSET_Y = 0                 # Offset between the window frame and the client area.
         self.DEFAULT_INPUT_SOURCE_INDEX = None   # The default input source index; determined dynamically.
+        self.DEVICE_QUERY_CACHE_SECONDS = 5.0    # How long enumerated audio devices/host APIs are reused before querying PortAudio again.
+        self.INPUT_DEVICE_CHANGE_DELAY_MS = 150  # Wait this long after the last input device selection before reopening the stream.
+        self.SLIDER_APPLY_DELAY_MS = 30          # Apply sensitivity/volume slider drags to the audio worker at most this often.
+        self.AUDIO_ERROR_DIALOG_INTERVAL_S = 2.0  # Audio errors arriving sooner than this after the last dialog are only printed.
 
         # Control Defaults
         self.DEFAULT_SENSITIVITY = 5             # Default sensitivity percentage (for noise rejection).
@@ -214,6 +227,7 @@ class Defaults:
 
         # Data retention: maximum age (in seconds) of data points kept in the canvas.
         self.MAX_DATA_AGE = 120
+        self.PIANO_ROLL_POINT_CAPACITY = 16384   # Initial pitch-line sample capacity (doubles if MAX_DATA_AGE holds more).
 
         # --- New Hardware Acceleration parameters ---
         self.ENABLE_HW_ACCELERATION = True       # Enable hardware accelerated rendering (uses QOpenGLWidget)
@@ -234,11 +248,20 @@ class Defaults:
         self.SILENT_DURATION = 0.5               # Duration (in seconds) of silence before triggering auto-pause and a break.
 
         self.ENABLE_FORCED_PIANOROLL_UPDATE = False
+        self.PIANO_ROLL_IDLE_REPAINT_MS = 250    # While no new data arrives, the piano roll repaints at most this often (ms).
+        self.PIANO_ROLL_VU_REPAINT_MS = 33       # Minimum interval (ms) between repaints caused only by VU meter changes.
+        self.COALESCE_WORKER_EVENTS = True       # Queue pitch/state events and VU levels and drain them once per GUI tick instead of one signal each.
+        self.WORKER_EVENT_QUEUE_SIZE = 256       # Maximum queued worker events (oldest are dropped if the GUI stalls).
+        self.VU_EMIT_MIN_CHANGE_DB = 0.5         # Uncoalesced VU signals are skipped while both levels change less than this.
         self.DEFAULT_PIANO_ROLL_UPDATE_FPS = 60  # Number of updates per second for the Piano Roll display.
         self.MAX_AUDIO_WORKER_LOOP_HZ = 60       # Maximum frequency (in Hz) for AudioStreamWorker loop iterations.
+        self.ENABLE_REALTIME_THREAD_PRIORITY = True  # Request OS realtime scheduling for the audio worker (MMCSS "Pro Audio" / SCHED_FIFO).
+        self.REALTIME_THREAD_PRIORITY = 50       # SCHED_FIFO priority (1-99) used on Linux when realtime scheduling is enabled.
+        self.LOCK_AUDIO_BUFFER_PAGES = True      # Pre-fault and lock the callback ring buffer in RAM (mlock / VirtualLock).
 
         self._FMAX = 1000
         self._FMIN = 30
+        self.DETECTION_DECIMATION = 1            # Down-sample factor applied before pitch detection (1 = full sample rate, 3 = 16 kHz at 48 kHz).
 
         self.TUNING_FREQUENCY = 440.0            # Reference tuning frequency for A4 (in Hertz).
 
@@ -310,6 +333,55 @@ class Defaults:
         # Version tracking for configuration
         self.CONFIG_VERSION = 2  # Increment when defaults change significantly
 
+        # Scale lookup cache (rebuilt by rebuild_scale_cache() whenever root/scale/notation changes)
+        self._scale_notes = ()                   # Spelled notes of the current scale.
+        self._scale_mask = 0                     # Bit k set <=> pitch class k (C=0) is in the scale.
+        self._scale_spelling = [None] * 12       # Scale spelling per pitch class (None if not in scale).
+        self._root_pc = -1                       # Pitch class of the current root note.
+        self._scale_pc_at_or_below = [None] * 12  # Per pitch class: nearest scale pitch class at or below it.
+        self._midi_color_idx = np.zeros(128, dtype=np.uint8)  # Per-MIDI grid color: 0 non-diatonic, 1 diatonic, 2 root.
+        self._prefer_sharps_for_key = True       # use_sharps_for_key() for the current root/scale/notation.
+
+        # Public attributes persisted to the config file (fixed once all defaults are defined above)
+        self._serializable_attrs = tuple(attr for attr, v in self.__dict__.items()
+                                         if not attr.startswith("_") and not callable(v))
+        self._save_lock = threading.Lock()       # Serializes config file writes.
+
+    def rebuild_scale_cache(self):
+        """
+        Rebuilds the scale lookup tables used by the drawing and note naming code.
+        Must be called whenever current_root_note, current_scale or global_prefer_sharps changes,
+        so the per-frame paths can test membership with a bit test instead of regenerating the scale.
+        """
+        self._scale_notes = self.generate_scale()
+        self._scale_mask = 0
+        self._scale_spelling = [None] * 12
+        for note in self._scale_notes:
+            pc = NAME_TO_PC[canonical_note(note)]
+            if self._scale_spelling[pc] is None:
+                self._scale_spelling[pc] = note
+            self._scale_mask |= 1 << pc
+
+        root = self.current_root_note.split("/")[0] if "/" in self.current_root_note else self.current_root_note
+        self._root_pc = NAME_TO_PC.get(canonical_note(root), -1)
+
+        # Nearest scale pitch class at or below each pitch class (the pitch panel's closest-note search)
+        self._scale_pc_at_or_below = [None] * 12
+        for pc in range(12):
+            for step in range(12):
+                if (self._scale_mask >> ((pc - step) % 12)) & 1:
+                    self._scale_pc_at_or_below[pc] = (pc - step) % 12
+                    break
+
+        color_idx = np.zeros(128, dtype=np.uint8)
+        if self.current_scale != "-":
+            pcs = np.arange(128) % 12
+            color_idx[((self._scale_mask >> pcs) & 1) == 1] = 1
+            color_idx[pcs == self._root_pc] = 2
+        self._midi_color_idx = color_idx
+        self._prefer_sharps_for_key = use_sharps_for_key()
+        _note_label.cache_clear()
+
     def generate_scale(self, root_note=None, scale_type=None, with_solfege=False):
         """
         Generate a correctly spelled scale using lookup tables.
@@ -320,7 +392,7 @@ class Defaults:
             with_solfege (bool, optional): Return solfege names instead. Defaults to False.
 
         Returns:
-            list: Correctly spelled note names for the scale.
+            tuple: Correctly spelled note names for the scale (shared, read-only).
         """
         if root_note is None:
             root_note = self.current_root_note
@@ -328,7 +400,7 @@ class Defaults:
             scale_type = self.current_scale
 
         if scale_type == "-":
-            return []
+            return ()
 
         # Parse composite root: "C#/D♭" -> use first part's canonical form
         # For non-composite roots, preserve the original form (e.g., "G♭" stays "G♭")
@@ -338,75 +410,58 @@ class Defaults:
         else:
             raw_root = root_note
 
-        scale_notes = self._build_scale(raw_root, scale_type)
+        scale_notes = self._build_scale(raw_root, scale_type, self.global_prefer_sharps)
 
         if with_solfege:
-            return [note_to_solfege(n) for n in scale_notes]
+            return tuple(note_to_solfege(n) for n in scale_notes)
         return scale_notes
 
-    def _build_scale(self, raw_root, scale_type):
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _build_scale(raw_root, scale_type, prefer_sharps=True):
         """
         Internal: build the correctly spelled scale for the given root and type.
-        raw_root may be in sharp or flat form (e.g., "F#" or "G♭").
+        raw_root may be in sharp or flat form (e.g., "F#" or "G♭"); prefer_sharps selects the
+        Chromatic spelling. The result is a pure function of the arguments, so it is memoized
+        and returned as a shared immutable tuple.
         """
         # Canonical form for index-based operations; original form for resolution maps
         canon_root = canonical_note(raw_root)
 
         # --- Chromatic: use global preference ---
         if scale_type == "Chromatic":
-            if defaults.global_prefer_sharps:
-                return list(SHARP_LETTER_NAMES)
+            if prefer_sharps:
+                return SHARP_LETTER_NAMES
             else:
-                return list(FLAT_LETTER_NAMES)
+                return FLAT_LETTER_NAMES
 
         # --- Major scale: direct lookup ---
         if scale_type == "Major":
-            resolved = ROOT_TO_MAJOR_KEY.get(raw_root, ROOT_TO_MAJOR_KEY.get(canon_root, raw_root))
-            return list(MAJOR_SCALES.get(resolved, MAJOR_SCALES["C"]))
+            resolved = ROOT_RESOLVED_MAJOR.get(raw_root, raw_root)
+            return MAJOR_SCALES.get(resolved, MAJOR_SCALES["C"])
 
         # --- Natural Minor: direct lookup ---
         if scale_type == "Natural Minor":
-            resolved = ROOT_TO_MINOR_KEY.get(raw_root, ROOT_TO_MINOR_KEY.get(canon_root, raw_root))
-            return list(NATURAL_MINOR_SCALES.get(resolved, NATURAL_MINOR_SCALES["A"]))
+            resolved = ROOT_RESOLVED_MINOR.get(raw_root, raw_root)
+            return NATURAL_MINOR_SCALES.get(resolved, NATURAL_MINOR_SCALES["A"])
 
-        # --- Harmonic Minor: natural minor with raised 7th ---
+        # --- Harmonic Minor: natural minor with raised 7th (precomputed) ---
         if scale_type == "Harmonic Minor":
-            resolved = ROOT_TO_MINOR_KEY.get(raw_root, ROOT_TO_MINOR_KEY.get(canon_root, raw_root))
-            minor = list(NATURAL_MINOR_SCALES.get(resolved, NATURAL_MINOR_SCALES["A"]))
-            try:
-                minor[6] = _raise_note(minor[6])
-            except ValueError:
-                # Double sharp needed — switch to enharmonic key directly
-                # (bypass ROOT_TO_MINOR_KEY to avoid looping back to the sharp key)
-                alt_root = self._enharmonic_minor_alt(canon_root)
-                minor = list(NATURAL_MINOR_SCALES.get(alt_root, NATURAL_MINOR_SCALES["A"]))
-                minor[6] = _raise_note(minor[6])
-            return minor
-
-        # --- Melodic Minor: natural minor with raised 6th and 7th ---
+            resolved = ROOT_RESOLVED_MINOR.get(raw_root, raw_root)
+            return HARMONIC_MINOR_SCALES.get(resolved, HARMONIC_MINOR_SCALES["A"])
+
+        # --- Melodic Minor: natural minor with raised 6th and 7th (precomputed) ---
         if scale_type == "Melodic Minor":
-            resolved = ROOT_TO_MINOR_KEY.get(raw_root, ROOT_TO_MINOR_KEY.get(canon_root, raw_root))
-            minor = list(NATURAL_MINOR_SCALES.get(resolved, NATURAL_MINOR_SCALES["A"]))
-            try:
-                minor[5] = _raise_note(minor[5])
-                minor[6] = _raise_note(minor[6])
-            except ValueError:
-                alt_root = self._enharmonic_minor_alt(canon_root)
-                minor = list(NATURAL_MINOR_SCALES.get(alt_root, NATURAL_MINOR_SCALES["A"]))
-                minor[5] = _raise_note(minor[5])
-                minor[6] = _raise_note(minor[6])
-            return minor
+            resolved = ROOT_RESOLVED_MINOR.get(raw_root, raw_root)
+            return MELODIC_MINOR_SCALES.get(resolved, MELODIC_MINOR_SCALES["A"])
 
         # --- Modes: find parent major, rotate ---
         if scale_type in MODE_OFFSETS:
-            try:
-                root_index = SHARP_LETTER_NAMES.index(canon_root)
-            except ValueError:
-                root_index = 0
+            root_index = NAME_TO_PC.get(canon_root, 0)
             parent_index = (root_index + MODE_OFFSETS[scale_type]) % 12
             parent_root = SHARP_LETTER_NAMES[parent_index]
             parent_resolved = ROOT_TO_MAJOR_KEY.get(parent_root, parent_root)
-            parent_scale = list(MAJOR_SCALES.get(parent_resolved, MAJOR_SCALES["C"]))
+            parent_scale = MAJOR_SCALES.get(parent_resolved, MAJOR_SCALES["C"])
 
             # Find the mode root in the parent scale
             for i, note in enumerate(parent_scale):
@@ -418,22 +473,22 @@ class Defaults:
 
         # --- Major Pentatonic: degrees 1,2,3,5,6 of major ---
         if scale_type == "Major Pentatonic":
-            major = self._build_scale(raw_root, "Major")
-            return [major[i] for i in (0, 1, 2, 4, 5)]
+            major = Defaults._build_scale(raw_root, "Major")
+            return tuple(major[i] for i in (0, 1, 2, 4, 5))
 
         # --- Minor Pentatonic: degrees 1,3,4,5,7 of natural minor ---
         if scale_type == "Minor Pentatonic":
-            minor = self._build_scale(raw_root, "Natural Minor")
-            return [minor[i] for i in (0, 2, 3, 4, 6)]
+            minor = Defaults._build_scale(raw_root, "Natural Minor")
+            return tuple(minor[i] for i in (0, 2, 3, 4, 6))
 
         # Fallback: major scale
-        return list(MAJOR_SCALES.get("C"))
+        return MAJOR_SCALES["C"]
 
-    def _enharmonic_minor_alt(self, canon_root):
+    @staticmethod
+    def _enharmonic_minor_alt(canon_root):
         """Find the enharmonic alternative root for a minor key to avoid double sharps."""
-        try:
-            idx = SHARP_LETTER_NAMES.index(canon_root)
-        except ValueError:
+        idx = NAME_TO_PC.get(canon_root)
+        if idx is None:
             return canon_root
         # Get the flat name for the same pitch
         return FLAT_LETTER_NAMES[idx] if FLAT_LETTER_NAMES[idx] != SHARP_LETTER_NAMES[idx] else canon_root
@@ -448,12 +503,11 @@ class Defaults:
         """
         try:
             if os.path.exists(filename):
-                with open(filename, "r") as f:
-                    loaded_config = json.load(f)
-                # Loop over all public attributes (skip ones starting with "_")
-                for attr in self.__dict__:
-                    if attr.startswith("_"):
-                        continue
+                # Read the whole file in one call; json.loads detects the UTF encoding from the bytes.
+                with open(filename, "rb") as f:
+                    loaded_config = json.loads(f.read())
+                # Loop over all public attributes
+                for attr in self._serializable_attrs:
                     config_key = attr.lower()
                     if config_key in loaded_config:
                         value = loaded_config[config_key]
@@ -466,29 +520,47 @@ class Defaults:
                 print(f"Config file {filename} not found. Using default values.")
         except Exception as e:
             print(f"Error loading config from {filename}: {e}")
+        self.rebuild_scale_cache()
 
-    def SaveConfigToFile(self, filename=os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")):
+    def SaveConfigToFile(self, filename=os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json"), background=False):
         """
         Saves the current configuration values to a JSON file.
-        All keys are saved in lowercase.
+        All keys are saved in lowercase. The values are serialized on the calling thread; the
+        file is written to a temporary path and renamed over the old config, so a crash mid-write
+        never leaves a truncated file.
 
         Args:
             filename (str): The path to the configuration file.
+            background (bool): If True, write the file from a worker thread so the GUI thread does not block.
         """
         try:
             config_to_save = {}
-            # Only save public attributes (skip any that start with "_")
-            for attr, v in self.__dict__.items():
-                if attr.startswith("_") or callable(v):
-                    continue
+            for attr in self._serializable_attrs:
+                v = getattr(self, attr)
                 if attr in self._color_attrs and isinstance(v, QColor):
                     config_to_save[attr.lower()] = v.name()
                 else:
                     config_to_save[attr.lower()] = v
-            with open(filename, "w") as f:
-                json.dump(config_to_save, f, indent=4, default=str)
+            payload = json.dumps(config_to_save, indent=4, default=str)
         except Exception as e:
             print(f"Error saving config to {filename}: {e}")
+            return
+
+        if background:
+            threading.Thread(target=self._write_config, args=(filename, payload), name="ConfigWriter").start()
+        else:
+            self._write_config(filename, payload)
+
+    def _write_config(self, filename, payload):
+        """Internal: atomically replace filename with the serialized payload."""
+        with self._save_lock:
+            tmp_filename = filename + ".tmp"
+            try:
+                with open(tmp_filename, "w") as f:
+                    f.write(payload)
+                os.replace(tmp_filename, filename)
+            except Exception as e:
+                print(f"Error saving config to {filename}: {e}")
 
     def updateWindowGeometry(self, window):
         """
@@ -545,10 +617,16 @@ defaults.InitDefaults()
 
 
 # --------------------------- Helper Function for Drawing Adjusted Text ---------------------------
+# Cache of prepared text layout for drawAdjustedText, keyed by (font key, text, flat_char).
+_ADJUSTED_TEXT_CACHE = {}
+_ADJUSTED_TEXT_CACHE_SIZE = 512
+
 def drawAdjustedText(painter, x, y, text, flat_char="♭", adjustment=-2):
     """
     Draws a text string with adjusted spacing for each occurrence of flat_char.
     The adjustment value is added to the x position when drawing the flat character.
+    The split parts are cached per font and text as QStaticText objects together with their
+    advances, so repeated labels skip both the font metrics queries and the text layout.
 
     Parameters:
         painter (QPainter): The painter to draw on.
@@ -558,24 +636,47 @@ def drawAdjustedText(painter, x, y, text, flat_char="♭", adjustment=-2):
         adjustment (int): The x offset adjustment to apply for the flat character.
     """
     font = painter.font()
-    metrics = QFontMetrics(font)
+    key = (font.key(), text, flat_char)
+    layout = _ADJUSTED_TEXT_CACHE.get(key)
+    if layout is None:
+        metrics = QFontMetrics(font)
+        parts = []
+        for part in text.split(flat_char) + [flat_char]:
+            static_text = QStaticText(part)
+            static_text.setTextFormat(Qt.PlainText)
+            static_text.prepare(painter.transform(), font)
+            parts.append((static_text, metrics.horizontalAdvance(part)))
+        flat_text, flat_width = parts.pop()
+        # QStaticText is positioned by its top-left corner; drawText by its baseline.
+        layout = (tuple(parts), flat_text, flat_width - 5, metrics.ascent())
+        if len(_ADJUSTED_TEXT_CACHE) >= _ADJUSTED_TEXT_CACHE_SIZE:
+            _ADJUSTED_TEXT_CACHE.clear()
+        _ADJUSTED_TEXT_CACHE[key] = layout
+
+    parts, flat_text, flat_advance, ascent = layout
+    top = y - ascent
     current_x = x
-    parts = text.split(flat_char)
-    for i, part in enumerate(parts):
-        painter.drawText(current_x, y, part)
-        current_x += metrics.horizontalAdvance(part)
-        if i < len(parts) - 1:
-            painter.drawText(current_x + adjustment, y, flat_char)
-            current_x += metrics.horizontalAdvance(flat_char) - 5
+    last = len(parts) - 1
+    for i, (part, advance) in enumerate(parts):
+        painter.drawStaticText(QPointF(current_x, top), part)
+        current_x += advance
+        if i < last:
+            painter.drawStaticText(QPointF(current_x + adjustment, top), flat_text)
+            current_x += flat_advance
     return current_x - x
 
 
 
+# HTML fragment substituted for every flat sign by format_note_with_html
+_FLAT_HTML = "<span style='letter-spacing: -20px;'> </span><span style='letter-spacing: -10px;'>{}</span>"
+
 # New function to format notes with HTML for better flat symbol handling
+@functools.lru_cache(maxsize=512)
 def format_note_with_html(text, flat_char="♭"):
     """
     Formats a text string by wrapping each occurrence of flat_char in a span with a specified class.
-    This allows targeting the flat symbol with CSS for better spacing control.
+    This allows targeting the flat symbol with CSS for better spacing control. Results are memoized,
+    since the pitch panel only ever shows a few hundred distinct note labels.
     
     Parameters:
         text (str): The text string to format.
@@ -587,15 +688,7 @@ def format_note_with_html(text, flat_char="♭"):
     """
     if flat_char not in text:
         return text
-        
-    parts = text.split(flat_char)
-    result = parts[0]
-    
-    for i in range(1, len(parts)):
-        result += f"<span style='letter-spacing: -20px;'> </span><span style='letter-spacing: -10px;'>{flat_char}</span>" + parts[i]
-        #result += f"{flat_char}" + parts[i]
-
-    return result
+    return text.replace(flat_char, _FLAT_HTML.format(flat_char))
 
 
 
@@ -652,16 +745,32 @@ def _raise_note(note):
 def use_sharps_for_key():
     """
     Determines whether to use sharp or flat notation based on the current scale and root note.
-    Resolves the effective key and checks if it's a sharp-side or flat-side key.
+    The answer for every root/scale combination offered in the UI is precomputed in _SHARP_BY_KEY.
 
     Returns:
         bool: True if sharps should be used; False if flats should be used.
     """
-    root_note = defaults.current_root_note
-    scale_type = defaults.current_scale
+    key = (defaults.current_scale, defaults.current_root_note)
+    sharps = _SHARP_BY_KEY.get(key)
+    if sharps is None:
+        sharps = _key_prefers_sharps(*key)
+    return defaults.global_prefer_sharps if sharps is None else sharps
+
+
+def _key_prefers_sharps(scale_type, root_note):
+    """
+    Resolves the effective key and checks if it's a sharp-side or flat-side key.
 
+    Args:
+        scale_type (str): The scale/mode name.
+        root_note (str): The root note as shown in the UI (e.g. "C#/D♭").
+
+    Returns:
+        bool: True for sharp-side keys, False for flat-side keys, or None if the scale has no
+              key signature (the global notation preference applies).
+    """
     if scale_type == "-" or scale_type == "Chromatic":
-        return defaults.global_prefer_sharps
+        return None
 
     # Parse composite root: "C#/D♭" -> try first part
     if "/" in root_note:
@@ -673,10 +782,7 @@ def use_sharps_for_key():
     # Determine which key we actually resolve to
     if scale_type in MODE_OFFSETS:
         # Find parent major key
-        try:
-            root_index = SHARP_LETTER_NAMES.index(raw_root)
-        except ValueError:
-            root_index = 0
+        root_index = NAME_TO_PC.get(raw_root, 0)
         parent_index = (root_index + MODE_OFFSETS[scale_type]) % 12
         parent_root = SHARP_LETTER_NAMES[parent_index]
         # Check if parent maps to a flat key
@@ -691,23 +797,55 @@ def use_sharps_for_key():
         resolved = ROOT_TO_MINOR_KEY.get(raw_root, raw_root)
         # Minor key is sharp if its relative major is sharp
         # Relative major is 3 semitones up
-        try:
-            minor_index = SHARP_LETTER_NAMES.index(canonical_note(resolved))
-        except ValueError:
-            minor_index = 0
+        minor_index = NAME_TO_PC.get(canonical_note(resolved), 0)
         rel_major_index = (minor_index + 3) % 12
         rel_major_root = SHARP_LETTER_NAMES[rel_major_index]
         rel_major_resolved = ROOT_TO_MAJOR_KEY.get(rel_major_root, rel_major_root)
         return rel_major_resolved in SHARP_MAJOR_KEYS
 
-    return defaults.global_prefer_sharps
+    return None
 
 
 # --------------------------- Enharmonic Mapping Functions ---------------------------
+_DIGITS = '0123456789'
+
+# Map all enharmonic equivalents to a canonical (sharp) form
+_ENHARMONIC_MAP = {
+    # Standard flats to sharps
+    'D♭': 'C#',
+    'E♭': 'D#',
+    'G♭': 'F#',
+    'A♭': 'G#',
+    'B♭': 'A#',
+    # Natural notes with flats/sharps
+    'F♭': 'E',
+    'E#': 'F',
+    'C♭': 'B',
+    'B#': 'C',
+    # Double sharps and flats
+    'C##': 'D',
+    'D##': 'E',
+    'E##': 'F#',
+    'F##': 'G',
+    'G##': 'A',
+    'A##': 'B',
+    'B##': 'C#',
+    'C♭♭': 'A#',
+    'D♭♭': 'C',
+    'E♭♭': 'D',
+    'F♭♭': 'D#',
+    'G♭♭': 'F',
+    'A♭♭': 'G',
+    'B♭♭': 'A'
+}
+
+
+@functools.lru_cache(maxsize=256)
 def canonical_note(note):
     """
     Convert note representations to their canonical sharp representations.
-    Handles standard accidentals, double sharps, and double flats.
+    Handles standard accidentals, double sharps, and double flats. Results are memoized, since
+    callers such as the pitch panel pass the same few dozen spellings on every update.
     
     Args:
         note (str): The note string which might be in flat notation.
@@ -715,49 +853,69 @@ def canonical_note(note):
     Returns:
         str: The canonical (sharp) representation of the note.
     """
-    # Map all enharmonic equivalents to a canonical form
-    enharmonic_to_canonical = {
-        # Standard flats to sharps
-        'D♭': 'C#',
-        'E♭': 'D#',
-        'G♭': 'F#',
-        'A♭': 'G#',
-        'B♭': 'A#',
-        # Natural notes with flats/sharps
-        'F♭': 'E',
-        'E#': 'F',
-        'C♭': 'B',
-        'B#': 'C',
-        # Double sharps and flats
-        'C##': 'D',
-        'D##': 'E',
-        'E##': 'F#',
-        'F##': 'G',
-        'G##': 'A',
-        'A##': 'B',
-        'B##': 'C#',
-        'C♭♭': 'A#',
-        'D♭♭': 'C',
-        'E♭♭': 'D',
-        'F♭♭': 'D#',
-        'G♭♭': 'F',
-        'A♭♭': 'G',
-        'B♭♭': 'A'
-    }
-    # Remove any octave numbers before lookup
-    base_note = note.rstrip('0123456789')
-    octave = ''.join(c for c in note if c.isdigit())
-    
-    # Get the canonical form of the base note
-    canonical = enharmonic_to_canonical.get(base_note, base_note)
-    
-    # Reattach octave number if present
-    if octave:
-        return canonical + octave
-    return canonical
+    # Split off any trailing octave number, look up the canonical form and reattach the octave
+    base_note = note.rstrip(_DIGITS)
+    return _ENHARMONIC_MAP.get(base_note, base_note) + note[len(base_note):]
+
+
+# Every root spelling _build_scale can receive (plain, sharp, flat and enharmonic forms).
+_ALL_ROOT_FORMS = (set(SHARP_LETTER_NAMES) | set(FLAT_LETTER_NAMES) | set(ROOT_TO_MAJOR_KEY) |
+                   set(ROOT_TO_MINOR_KEY) | {"E#", "B#", "F♭", "C♭"})
+
+# Root spelling -> key used for the scale tables, resolved once instead of through chained lookups
+ROOT_RESOLVED_MAJOR = {r: ROOT_TO_MAJOR_KEY.get(r, ROOT_TO_MAJOR_KEY.get(canonical_note(r), r)) for r in _ALL_ROOT_FORMS}
+ROOT_RESOLVED_MINOR = {r: ROOT_TO_MINOR_KEY.get(r, ROOT_TO_MINOR_KEY.get(canonical_note(r), r)) for r in _ALL_ROOT_FORMS}
+
+
+def _derive_raised_minor(key, degrees):
+    """
+    Derives a raised-degree minor scale (harmonic/melodic) from the natural minor table.
+    If raising a degree would need a double sharp, the enharmonic key is used directly
+    (bypassing ROOT_TO_MINOR_KEY to avoid looping back to the sharp key).
+
+    Args:
+        key (str): A NATURAL_MINOR_SCALES key.
+        degrees (tuple): Scale degree indices (0-based) to raise by a semitone.
+
+    Returns:
+        tuple: The correctly spelled scale.
+    """
+    minor = list(NATURAL_MINOR_SCALES[key])
+    try:
+        for degree in degrees:
+            minor[degree] = _raise_note(minor[degree])
+    except ValueError:
+        # Double sharp needed — switch to enharmonic key directly
+        alt_root = Defaults._enharmonic_minor_alt(canonical_note(key))
+        minor = list(NATURAL_MINOR_SCALES.get(alt_root, NATURAL_MINOR_SCALES["A"]))
+        for degree in degrees:
+            minor[degree] = _raise_note(minor[degree])
+    return tuple(minor)
+
+
+# Correctly spelled harmonic and melodic minor scales, derived once at import
+HARMONIC_MINOR_SCALES = {k: _derive_raised_minor(k, (6,)) for k in NATURAL_MINOR_SCALES}
+MELODIC_MINOR_SCALES = {k: _derive_raised_minor(k, (5, 6)) for k in NATURAL_MINOR_SCALES}
+
+# (scale, root) -> sharp-side key, for every combination offered in the UI (see use_sharps_for_key)
+_SHARP_BY_KEY = {(scale, root): sharps
+                 for scale in defaults.SCALE_OPTIONS for root in defaults.NOTE_TO_INDEX
+                 for sharps in (_key_prefers_sharps(scale, root),) if sharps is not None}
 
 
 # --------------------------- Utility Functions ---------------------------
+# Base solfege syllables
+_BASE_SOLFEGE = {
+    'C': 'Do',
+    'D': 'Re',
+    'E': 'Mi',
+    'F': 'Fa',
+    'G': 'Sol',
+    'A': 'La',
+    'B': 'Si'
+}
+
+
 def note_to_solfege(note_name):
     """
     Convert a note name to its solfege equivalent, handling enharmonics, double sharps, and double flats.
@@ -768,27 +926,16 @@ def note_to_solfege(note_name):
     Returns:
         str: The corresponding solfege name (e.g., 'Do#', 'Si#', 'Sol##')
     """
-    # Base solfege syllables
-    base_solfege = {
-        'C': 'Do',
-        'D': 'Re',
-        'E': 'Mi',
-        'F': 'Fa',
-        'G': 'Sol',
-        'A': 'La',
-        'B': 'Si'
-    }
-    
     # Handle notes with or without octave numbers
-    base_note = note_name.rstrip('0123456789')
-    octave = ''.join(c for c in note_name if c.isdigit())
+    base_note = note_name.rstrip(_DIGITS)
+    octave = note_name[len(base_note):]
     
     # Separate the letter from accidentals
     letter = base_note[0]
     accidentals = base_note[1:] if len(base_note) > 1 else ''
     
     # Convert the letter to solfege
-    solfege = base_solfege.get(letter, letter)  # Fallback to the letter if not found
+    solfege = _BASE_SOLFEGE.get(letter, letter)  # Fallback to the letter if not found
     
     # Append the accidentals to the solfege name
     solfege_with_accidentals = solfege + accidentals
@@ -799,35 +946,52 @@ def note_to_solfege(note_name):
         
     return solfege_with_accidentals
 
-def frequency_to_note(frequency, prefer_sharps=True):
-    if frequency <= 0:
-        return "", "", -1, 0
-    midi = 69 + 12 * math.log2(frequency / defaults.TUNING_FREQUENCY)
-    midi_int = int(round(midi))
-    cents = int(round((midi - midi_int) * 100))
+# Note label followed by the frequency readout, e.g. "La (440.0 Hz)"
+_FREQ_LABEL_FMT = "%s (%.1f Hz)"
 
-    # Compute the exact (equal-tempered) frequency corresponding to the computed MIDI note.
-    et_frequency = defaults.TUNING_FREQUENCY * (2 ** ((midi_int - 69) / 12))
-    if midi_int == 69:
-        et_frequency = defaults.TUNING_FREQUENCY
+# Half of one cent as a frequency ratio offset: f * _HALF_CENT_RATIO is half a cent above f.
+_HALF_CENT_RATIO = (2 ** (1/1200) - 1) / 2
 
-    one_cent = et_frequency * (2 ** (1/1200) - 1)
-    if abs(frequency - et_frequency) < one_cent / 2:
-        frequency = et_frequency
-        cents = 0
 
+@functools.lru_cache(maxsize=4)
+def et_frequencies(tuning_frequency):
+    """
+    Returns the equal-tempered frequency of every MIDI note for a reference tuning, so
+    frequency_to_note can look the note frequency up instead of evaluating a power per frame.
+
+    Args:
+        tuning_frequency (float): Reference frequency of A4 (MIDI 69) in Hertz.
+
+    Returns:
+        tuple: 128 frequencies in Hertz indexed by MIDI note number.
+    """
+    return tuple(tuning_frequency * (2 ** ((midi - 69) / 12)) for midi in range(128))
+
+
+@functools.lru_cache(maxsize=4096)
+def _note_label(midi_int, prefer_sharps, solfege_on, letters_on, octave_on):
+    """
+    Builds the note label text for a MIDI note. The result only depends on the note, the label
+    flags and the current scale spelling, so steady notes hit the cache instead of re-running the
+    spelling and solfege conversion every frame. Cleared by Defaults.rebuild_scale_cache().
+
+    Args:
+        midi_int (int): MIDI note number.
+        prefer_sharps (bool): Spell chromatic notes with sharps.
+        solfege_on (bool): Include the solfege name.
+        letters_on (bool): Include the letter name.
+        octave_on (bool): Append the octave number as a subscript.
+
+    Returns:
+        tuple: (note_text (str), full_note (str)).
+    """
     note_index = midi_int % 12
     octave_val = (midi_int // 12) - 1
 
     # Scale-aware note naming: if a scale is active, use scale spelling
     letter = None
     if defaults.current_scale not in ("-", "Chromatic"):
-        scale_notes = defaults.generate_scale()
-        canonical_pitch = SHARP_LETTER_NAMES[note_index]
-        for scale_note in scale_notes:
-            if canonical_note(scale_note) == canonical_pitch:
-                letter = scale_note
-                break
+        letter = defaults._scale_spelling[note_index]
 
     # Fallback to chromatic array
     if letter is None:
@@ -839,21 +1003,237 @@ def frequency_to_note(frequency, prefer_sharps=True):
     solfege = note_to_solfege(letter)
 
     note_text = ""
-    if defaults.PITCH_LABEL_SOLFEGE:
+    if solfege_on:
         note_text += f"{solfege}"
-    if defaults.PITCH_LABEL_LETTERS:
+    if letters_on:
         note_text += f" {letter}"
 
-    note_no_octave = note_text + f" ({frequency:.1f} Hz)"
-
-    if defaults.PITCH_LABEL_OCTAVE:
+    if octave_on:
         full_note = note_text + f"<sub>{octave_val}</sub>"
     else:
         full_note = note_text
 
+    return note_text, full_note
+
+
+def frequency_to_note(frequency, prefer_sharps=True):
+    if frequency <= 0:
+        return "", "", -1, 0
+    midi = 69 + 12 * math.log2(frequency / defaults.TUNING_FREQUENCY)
+    midi_int = int(round(midi))
+    cents = int(round((midi - midi_int) * 100))
+
+    # Look up the exact (equal-tempered) frequency corresponding to the computed MIDI note.
+    if 0 <= midi_int < 128:
+        et_frequency = et_frequencies(defaults.TUNING_FREQUENCY)[midi_int]
+    else:
+        et_frequency = defaults.TUNING_FREQUENCY * (2 ** ((midi_int - 69) / 12))
+
+    if abs(frequency - et_frequency) < et_frequency * _HALF_CENT_RATIO:
+        frequency = et_frequency
+        cents = 0
+
+    note_text, full_note = _note_label(midi_int, prefer_sharps, defaults.PITCH_LABEL_SOLFEGE,
+                                       defaults.PITCH_LABEL_LETTERS, defaults.PITCH_LABEL_OCTAVE)
+    # Only the frequency tail changes per frame; format it into the cached label in one step.
+    note_no_octave = _FREQ_LABEL_FMT % (note_text, frequency)
+
     return full_note, note_no_octave, midi_int, cents
 
 
+@functools.lru_cache(maxsize=8)
+def decimation_filter(factor, numtaps=31):
+    """
+    Returns a Hamming-windowed sinc low-pass FIR used as the anti-aliasing filter before
+    decimating by the given factor. The cutoff sits at 80% of the decimated Nyquist frequency.
+
+    Args:
+        factor (int): Integer decimation factor.
+        numtaps (int): Number of filter taps (odd, so the filter has an integer group delay).
+
+    Returns:
+        np.array: Read-only float32 filter taps normalized to unity DC gain.
+    """
+    cutoff = 0.8 / factor
+    n = np.arange(numtaps) - (numtaps - 1) / 2.0
+    taps = cutoff * np.sinc(cutoff * n) * np.hamming(numtaps)
+    taps = (taps / np.sum(taps)).astype(np.float32)
+    taps.setflags(write=False)
+    return taps
+
+
+def decimate_frame(frame, factor):
+    """
+    Low-pass filters and down-samples an audio frame so the pitch detectors search a shorter
+    frame. With fmax around 1 kHz, a 48 kHz stream decimated by 3 still leaves 8 kHz of
+    bandwidth for the harmonics the spectral methods rely on.
+
+    Args:
+        frame (np.array): The audio frame.
+        factor (int): Integer decimation factor (values <= 1 return the frame unchanged).
+
+    Returns:
+        np.array: The decimated frame (float32).
+    """
+    if factor <= 1:
+        return frame
+    filtered = np.convolve(frame, decimation_filter(factor), mode="same")
+    return filtered[::factor].astype(np.float32, copy=False)
+
+
+@functools.lru_cache(maxsize=16)
+def spectral_setup(N, sample_rate):
+    """
+    Returns the frame-size dependent state shared by the spectral pitch detectors. The audio
+    worker always passes frames of the same length, so the Hann window, the power-of-two FFT
+    size and the bin frequencies are built once and reused instead of on every frame (numpy's
+    pocketfft already keeps its twiddle factors cached per transform length).
+
+    Args:
+        N (int): Frame length in samples.
+        sample_rate (int): The audio sample rate.
+
+    Returns:
+        tuple: (window (np.array), nfft (int), freqs (np.array)); the arrays are read-only.
+    """
+    # float32 like the frames, so windowing does not silently upcast every frame to float64.
+    window = np.hanning(N).astype(np.float32)
+    nfft = 2 ** int(np.ceil(np.log2(N)))
+    freqs = np.fft.rfftfreq(nfft, 1.0 / sample_rate)
+    window.setflags(write=False)
+    freqs.setflags(write=False)
+    return window, nfft, freqs
+
+
+def next_fast_len(n):
+    """
+    Returns the smallest 5-smooth integer (2**a * 3**b * 5**c) that is >= n. pocketfft handles
+    these sizes efficiently, and they are usually much closer to n than the next power of two.
+
+    Args:
+        n (int): Minimum transform length.
+
+    Returns:
+        int: The padded transform length.
+    """
+    best = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            size = p35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def windowed_frame(frame, sample_rate, remove_dc=True):
+    """
+    Shared pre-FFT step of the spectral pitch detectors: float32 conversion, optional DC removal
+    and the cached Hann window, applied in one place instead of repeated in every detector.
+
+    Args:
+        frame (np.array): The audio frame.
+        sample_rate (int): The audio sample rate.
+        remove_dc (bool): Subtract the frame mean before windowing.
+
+    Returns:
+        tuple: (windowed frame (np.array), nfft (int), freqs (np.array)), see spectral_setup().
+    """
+    window, nfft, freqs = spectral_setup(len(frame), sample_rate)
+    frame = np.asarray(frame, dtype=np.float32)
+    if remove_dc:
+        frame = frame - frame.mean()
+    return frame * window, nfft, freqs
+
+
+@functools.lru_cache(maxsize=16)
+def yin_setup(N, max_tau):
+    """
+    Returns the lag-indexing state for the YIN difference function. Frame length and lag range
+    are fixed by CHUNK_SIZE, the sample rate and fmin/fmax, so the kernel is specialized once per
+    configuration instead of rebuilding the FFT size and lag arrays on every frame.
+
+    Args:
+        N (int): Frame length in samples.
+        max_tau (int): Number of lags computed (0 .. max_tau - 1).
+
+    Returns:
+        tuple: (nfft (int), lags (np.array), overlap (np.array)) where overlap = N - lags;
+               the arrays are read-only.
+    """
+    # Zero-pad to at least N + max_tau so the circular correlation does not wrap into the used lags.
+    nfft = next_fast_len(N + max_tau)
+    lags = np.arange(max_tau)
+    overlap = N - lags
+    lags.setflags(write=False)
+    overlap.setflags(write=False)
+    return nfft, lags, overlap
+
+
+def fft_autocorrelation(x, max_tau):
+    """
+    Computes the autocorrelation r(tau) = sum(x[i] * x[i + tau]) for all lags below max_tau as
+    irfft(|rfft(x)|^2), zero-padded (see yin_setup) so the circular correlation does not wrap.
+
+    Args:
+        x (np.array): The signal.
+        max_tau (int): Number of lags to compute (0 .. max_tau - 1).
+
+    Returns:
+        np.array: Autocorrelation indexed by lag.
+    """
+    nfft, _, _ = yin_setup(len(x), max_tau)
+    spectrum = np.fft.rfft(x, nfft)
+    return np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, nfft)[:max_tau]
+
+
+def yin_difference(frame, max_tau):
+    """
+    Computes the YIN difference function d(tau) = sum((x[i] - x[i + tau])**2) for all lags
+    below max_tau in O(N log N), using an FFT-based autocorrelation instead of a per-lag loop:
+    d(tau) = E(0, N - tau) + E(tau, N) - 2 * r(tau), where E is the windowed signal energy.
+
+    Args:
+        frame (np.array): The audio frame as a NumPy array.
+        max_tau (int): Number of lags to compute (0 .. max_tau - 1).
+
+    Returns:
+        np.array: Unnormalized squared differences indexed by lag (float64).
+    """
+    x = frame.astype(np.float64)
+    N = len(x)
+    _, tau, overlap = yin_setup(N, max_tau)
+    acf = fft_autocorrelation(x, max_tau)
+    energy = np.concatenate(([0.0], np.cumsum(x * x)))
+    d = energy[overlap] + (energy[N] - energy[tau]) - 2.0 * acf
+    # Clamp tiny negative values produced by FFT rounding.
+    return np.maximum(d, 0.0, out=d)
+
+
+def parabolic_refine(d, tau):
+    """
+    Computes the sub-sample offset of a minimum (or maximum) of d at index tau by fitting a
+    parabola through its two neighbours. Only the three samples around tau are read.
+
+    Args:
+        d (np.array): Difference, CMND or correlation function indexed by lag.
+        tau (int): Index of the extremum to refine.
+
+    Returns:
+        float: Offset to add to tau, or 0.0 if tau is on the boundary or the fit is flat.
+    """
+    if tau <= 0 or tau >= len(d) - 1:
+        return 0.0
+    s0, s1, s2 = d[tau - 1], d[tau], d[tau + 1]
+    denom = s0 - 2 * s1 + s2
+    if denom == 0:
+        return 0.0
+    return 0.5 * (s0 - s2) / denom
+
 def yin_pitch(frame, sample_rate, fmin=50, fmax=1000, threshold=0.1):
     """
     Implements the YIN pitch detection algorithm on an audio frame.
@@ -873,16 +1253,16 @@ def yin_pitch(frame, sample_rate, fmin=50, fmax=1000, threshold=0.1):
     max_tau = int(sample_rate / fmin)
     if max_tau >= N:
         max_tau = N - 1
-    # Create an array of potential lags (tau) values.
-    tau_range = np.arange(1, max_tau)
-    # Calculate the squared difference (difference function) for each lag.
-    d = np.array([np.sum((frame[:-tau] - frame[tau:])**2) / (N - tau) for tau in tau_range])
+    # Potential lags (tau) and overlap lengths, shared across frames of this size.
+    _, lags, overlap = yin_setup(N, max_tau)
+    # Calculate the squared difference (difference function) for each lag, normalized by overlap length.
+    d = yin_difference(frame, max_tau)[1:] / overlap[1:]
     # Compute CMND vectorized:
     cmnd = np.empty_like(d)
     cmnd[0] = 1.0
     if len(d) > 1:
         cumulative = np.cumsum(d[1:])
-        indices = np.arange(1, len(d))
+        indices = lags[1:-1]
         cmnd[1:] = np.where(cumulative == 0, 1.0, d[1:] * indices / cumulative)
 
     tau_est = None
@@ -896,11 +1276,8 @@ def yin_pitch(frame, sample_rate, fmin=50, fmax=1000, threshold=0.1):
     if tau_est is None:
         return 0.0
     # Parabolic interpolation for a more precise estimation.
-    if tau_est > 1 and tau_est < len(cmnd) - 1:
-        s0, s1, s2 = cmnd[tau_est - 1], cmnd[tau_est], cmnd[tau_est + 1]
-        denom = 2 * (2 * s1 - s2 - s0)
-        if denom != 0:
-            tau_est = tau_est + (s2 - s0) / denom
+    if tau_est > 1:
+        tau_est = tau_est + parabolic_refine(cmnd, tau_est)
     pitch = sample_rate / tau_est
     # Verify that the detected pitch is within the expected bounds.
     if pitch < fmin or pitch > fmax:
@@ -914,15 +1291,11 @@ def pyin_pitch(audio_frame, sample_rate, fmin=defaults._FMIN, fmax=defaults._FMA
     Enhanced Probabilistic YIN (pYIN) pitch detection algorithm with debug output.
     """
 
-    frame = audio_frame.astype(np.float32)
-    frame = frame - np.mean(frame)  # Remove DC offset
-
-    # Apply Hanning window
-    window = np.hanning(len(frame))
-    frame = frame * window
+    # Remove DC offset and apply Hanning window
+    frame, _, _ = windowed_frame(audio_frame, sample_rate)
 
     N = len(frame)
-    rms = np.sqrt(np.mean(frame ** 2))
+    rms = math.sqrt(float(np.dot(frame, frame)) / N)
 
     # --- New: Noise gate based on RMS ---
     debug_msg = f"Signal RMS: {rms:.3f}\n"
@@ -942,18 +1315,16 @@ def pyin_pitch(audio_frame, sample_rate, fmin=defaults._FMIN, fmax=defaults._FMA
 
     # Step 1: Compute the normalized squared differences
     diff = np.zeros(tau_max + 1)
-    for tau in range(tau_min, tau_max + 1):
-        diff[tau] = np.sum((frame[:-tau] - frame[tau:]) ** 2) / (N - tau)
+    _, lags, overlap = yin_setup(N, tau_max + 1)
+    diff[tau_min:] = yin_difference(frame, tau_max + 1)[tau_min:] / overlap[tau_min:]
 
     # Step 2: Cumulative mean normalized difference function
     cmnd = np.zeros_like(diff)
     cmnd[0] = 1.0
 
-    # Compute normalization factor for each tau
-    running_sum = 0.0
-    for tau in range(1, len(diff)):
-        running_sum += diff[tau]
-        cmnd[tau] = tau * diff[tau] / (running_sum + 1e-12) / (N - tau)
+    # Normalize by the running mean of the differences (vectorized cumulative sum)
+    running_sum = np.cumsum(diff[1:])
+    cmnd[1:] = lags[1:] * diff[1:] / (running_sum + 1e-12) / overlap[1:]
 
     debug_msg += f"CMND range: {np.min(cmnd):.3f} to {np.max(cmnd):.3f}\n"
 
@@ -963,39 +1334,44 @@ def pyin_pitch(audio_frame, sample_rate, fmin=defaults._FMIN, fmax=defaults._FMA
                               defaults.PYIN_THRESHOLD_RANGE[1],
                               defaults.PYIN_THRESHOLD_STEPS)
 
-    for threshold in thresholds:
-        for tau in range(tau_min + defaults.PYIN_STABILITY_WINDOW, tau_max - defaults.PYIN_STABILITY_WINDOW):
-            window_vals = cmnd[tau - defaults.PYIN_STABILITY_WINDOW:tau + defaults.PYIN_STABILITY_WINDOW + 1]
-
-            # Check if this point is a local minimum
-            if (cmnd[tau] < threshold and
-                cmnd[tau] == min(window_vals) and
-                (1 - cmnd[tau]) > defaults.PYIN_MIN_PEAK_VAL):
-
-                # Parabolic interpolation
-                alpha = cmnd[tau - 1]
-                beta = cmnd[tau]
-                gamma = cmnd[tau + 1]
-
-                if beta < alpha and beta < gamma:
-                    # Refined period estimation using parabolic interpolation
-                    peak_pos = tau + 0.5 * (alpha - gamma) / (alpha - 2 * beta + gamma)
-
-                    # Calculate confidence metrics
-                    peak_height = 1 - beta
-                    stability = 1 - np.std(window_vals)
+    # The local-minimum, interpolation and stability tests do not depend on the threshold,
+    # so evaluate them once for every tau over sliding windows and only re-apply the threshold per step.
+    window = defaults.PYIN_STABILITY_WINDOW
+    taus = np.arange(tau_min + window, tau_max - window)
+    if taus.size > 0:
+        window_vals = np.lib.stride_tricks.sliding_window_view(cmnd[tau_min:tau_max], 2 * window + 1)
+        beta = cmnd[taus]
+        # Local minimum of its window, strong enough, and strictly below both neighbours
+        is_min = ((beta == window_vals.min(axis=1)) &
+                  ((1 - beta) > defaults.PYIN_MIN_PEAK_VAL) &
+                  (beta < cmnd[taus - 1]) & (beta < cmnd[taus + 1]))
+        idx = np.nonzero(is_min)[0]
+        taus = taus[idx]
+        beta = beta[idx]
+
+        # Refined period estimation using parabolic interpolation (denominator > 0 for strict minima)
+        s0, s2 = cmnd[taus - 1], cmnd[taus + 1]
+        peak_pos = taus + 0.5 * (s0 - s2) / (s0 - 2 * beta + s2)
+
+        # Calculate confidence metrics
+        peak_height = 1 - beta
+        strength = peak_height * (1 - window_vals[idx].std(axis=1))
+    else:
+        beta = peak_pos = peak_height = strength = np.empty(0)
 
-                    pitch = sample_rate / peak_pos
-                    confidence = peak_height * stability * (1 - threshold / defaults.PYIN_THRESHOLD_RANGE[1])
+    for threshold in thresholds:
+        sel = np.nonzero(beta < threshold)[0]
+        pitch = sample_rate / peak_pos[sel]
+        confidence = strength[sel] * (1 - threshold / defaults.PYIN_THRESHOLD_RANGE[1])
 
-                    # Add additional confidence boost for strong peaks
-                    if peak_height > 0.8:
-                        confidence *= 1.2
+        # Add additional confidence boost for strong peaks
+        confidence = np.where(peak_height[sel] > 0.8, confidence * 1.2, confidence)
 
-                    if fmin <= pitch <= fmax and confidence > defaults.PYIN_CONFIDENCE_THRESHOLD:
-                        candidates.append((pitch, confidence))
-                        debug_msg += (f"Candidate: {pitch:.1f}Hz (pos:{peak_pos:.1f}, "
-                                    f"conf:{confidence:.3f}, th:{threshold:.3f})\n")
+        accepted = (fmin <= pitch) & (pitch <= fmax) & (confidence > defaults.PYIN_CONFIDENCE_THRESHOLD)
+        for p, conf, pos in zip(pitch[accepted], confidence[accepted], peak_pos[sel][accepted]):
+            candidates.append((p, conf))
+            debug_msg += (f"Candidate: {p:.1f}Hz (pos:{pos:.1f}, "
+                        f"conf:{conf:.3f}, th:{threshold:.3f})\n")
 
     debug_msg += f"Total candidates: {len(candidates)}\n"
 
@@ -1044,19 +1420,18 @@ def autocorrelation_pitch(frame, sample_rate, fmin=50, fmax=1000):
     """
     # Remove DC offset by subtracting the mean.
     frame = frame - np.mean(frame)
-    # Compute the full autocorrelation of the frame.
-    corr = np.correlate(frame, frame, mode="full")
-    # Only consider the second half (non-negative lags).
-    corr = corr[len(corr)//2:]
+    N = len(frame)
     # Define lag range limits based on fmax and fmin.
     min_lag = int(sample_rate / fmax)
     max_lag = int(sample_rate / fmin)
-    if max_lag >= len(corr):
-        max_lag = len(corr) - 1
+    if max_lag >= N:
+        max_lag = N - 1
+    if max_lag <= min_lag:
+        return 0.0
+    # Autocorrelation for the non-negative lags below max_lag via FFT.
+    corr = fft_autocorrelation(frame, max_lag)
     # Extract the segment of the autocorrelation corresponding to the desired lags.
     segment = corr[min_lag:max_lag]
-    if len(segment) == 0:
-        return 0.0
     # Find the lag with the maximum correlation value.
     peak_index = np.argmax(segment)
     lag = peak_index + min_lag
@@ -1069,7 +1444,8 @@ def autocorrelation_pitch(frame, sample_rate, fmin=50, fmax=1000):
 
 def mpm_pitch(frame, sample_rate, fmin=50, fmax=1000, threshold=0.9):
     """
-    McLeod Pitch Method (MPM) with cumulative sum precomputation to optimize the per-tau denominator.
+    McLeod Pitch Method (MPM). The NSDF numerator and the per-tau energy denominator are computed
+    for all lags at once from an FFT autocorrelation and a cumulative energy sum.
     """
     frame = frame.astype(np.float32)
     frame = frame - np.mean(frame)
@@ -1078,36 +1454,68 @@ def mpm_pitch(frame, sample_rate, fmin=50, fmax=1000, threshold=0.9):
     min_tau = int(sample_rate / fmax)
     nsdf = np.zeros(max_tau + 1, dtype=np.float32)
 
-    # Precompute squared values and its cumulative sum for fast energy calculation.
-    squared = frame ** 2
-    cumsum = np.cumsum(squared)
-    total_energy = cumsum[-1]
-
-    for tau in range(min_tau, max_tau + 1):
-        numerator = 2 * np.dot(frame[:N - tau], frame[tau:])
-        energy1 = cumsum[N - tau - 1] if (N - tau - 1) >= 0 else 0.0
-        energy2 = total_energy - (cumsum[tau - 1] if tau - 1 >= 0 else 0.0)
-        denominator = energy1 + energy2
-        nsdf[tau] = numerator / denominator if denominator > 0 else 0.0
+    # Lags at or beyond the frame length have no overlap and keep an NSDF of 0.
+    n_lags = min(max_tau, N - 1) + 1
+    if n_lags > min_tau:
+        # Numerators 2 * r(tau) from one FFT autocorrelation; denominators from the cumulative energy.
+        _, lags, overlap = yin_setup(N, n_lags)
+        x = frame.astype(np.float64)
+        energy = np.concatenate(([0.0], np.cumsum(x * x)))
+        m = energy[overlap] + (energy[N] - energy[lags])
+        r = fft_autocorrelation(x, n_lags)
+        ratio = np.divide(2.0 * r, m, out=np.zeros_like(m), where=m > 0)
+        nsdf[min_tau:n_lags] = ratio[min_tau:]
 
     candidates = np.where(nsdf > threshold)[0]
     if candidates.size == 0:
         return 0.0
 
     tau_est = candidates[np.argmax(nsdf[candidates])]
-    if tau_est > 0 and tau_est < max_tau:
-        s0 = nsdf[tau_est - 1]
-        s1 = nsdf[tau_est]
-        s2 = nsdf[tau_est + 1]
-        denom = 2 * (s0 - 2 * s1 + s2)
-        if denom != 0:
-            tau_est = tau_est - (s2 - s0) / denom
+    tau_est = tau_est + parabolic_refine(nsdf, tau_est)
     pitch = sample_rate / tau_est if tau_est != 0 else 0.0
     if pitch < fmin or pitch > fmax:
         return 0.0
     return pitch
 
 
+@functools.lru_cache(maxsize=16)
+def swipe_setup(N, sample_rate, fmin, fmax, num_candidates=100, max_harmonic=9):
+    """
+    Returns the candidate grid for swipe_pitch with the nearest spectrum bin and weight of each
+    candidate harmonic, so the harmonic summation is a single gather and sum per frame.
+
+    Args:
+        N (int): Frame length in samples.
+        sample_rate (int): The audio sample rate.
+        fmin (float): Minimum pitch considered.
+        fmax (float): Maximum pitch considered.
+        num_candidates (int): Number of candidate frequencies between fmin and fmax.
+        max_harmonic (int): Highest harmonic summed per candidate.
+
+    Returns:
+        tuple: (candidate frequencies (np.array), bins (np.array), weights (np.array)); bins and
+               weights have shape (num_candidates, max_harmonic) and all arrays are read-only.
+    """
+    _, _, freqs = spectral_setup(N, sample_rate)
+    candidate_frequencies = np.linspace(fmin, fmax, num=num_candidates)
+    harmonics = np.arange(1, max_harmonic + 1)
+    targets = candidate_frequencies[:, None] * harmonics[None, :]
+
+    # Nearest bin: searchsorted gives the right neighbour, step back if the left one is closer.
+    bins = np.searchsorted(freqs, targets)
+    left = np.maximum(bins - 1, 0)
+    right = np.minimum(bins, len(freqs) - 1)
+    use_left = (bins > 0) & ((bins == len(freqs)) |
+                             (np.abs(freqs[right] - targets) > np.abs(freqs[left] - targets)))
+    bins = np.where(use_left, left, right)
+
+    # Harmonics at or above Nyquist do not contribute.
+    weights = np.where(targets < sample_rate / 2, 1.0 / harmonics[None, :], 0.0)
+    for arr in (candidate_frequencies, bins, weights):
+        arr.setflags(write=False)
+    return candidate_frequencies, bins, weights
+
+
 def swipe_pitch(frame, sample_rate, fmin=50, fmax=1000):
     """
     Implements a simplified version of the SWIPE algorithm.
@@ -1119,32 +1527,12 @@ def swipe_pitch(frame, sample_rate, fmin=50, fmax=1000):
     Returns:
         float: Detected pitch in Hz.
     """
-    frame = frame.astype(np.float32)
-    N = len(frame)
-    window = np.hanning(N)
-    xw = frame * window
-    nfft = 2 ** int(np.ceil(np.log2(N)))
+    xw, nfft, _ = windowed_frame(frame, sample_rate, remove_dc=False)
     X = np.abs(np.fft.rfft(xw, n=nfft))
-    freqs = np.fft.rfftfreq(nfft, 1.0 / sample_rate)
-    candidate_frequencies = np.linspace(fmin, fmax, num=100)
-    best_score = -np.inf
-    best_pitch = 0.0
-    for f in candidate_frequencies:
-        score = 0.0
-        h = 1
-        # Consider up to 10 harmonics (or until the harmonic exceeds Nyquist):
-        while h * f < sample_rate / 2 and h < 10:
-            target_freq = h * f
-            # Optimization: use searchsorted instead of argmin for fast lookup:
-            idx = np.searchsorted(freqs, target_freq)
-            if idx > 0 and (idx == len(freqs) or abs(freqs[idx] - target_freq) > abs(freqs[idx - 1] - target_freq)):
-                idx = idx - 1
-            weight = 1.0 / h
-            score += weight * X[idx]
-            h += 1
-        if score > best_score:
-            best_score = score
-            best_pitch = f
+    candidate_frequencies, bins, weights = swipe_setup(len(frame), sample_rate, fmin, fmax)
+    # Weighted harmonic sum for every candidate at once (weights are 0 above Nyquist)
+    scores = (X[bins] * weights).sum(axis=1)
+    best_pitch = candidate_frequencies[np.argmax(scores)]
     return best_pitch
 
 
@@ -1159,11 +1547,7 @@ def cepstrum_pitch(frame, sample_rate, fmin=50, fmax=1000):
     Returns:
         float: Detected pitch in Hz, or 0.0 if not found.
     """
-    frame = frame.astype(np.float32)
-    N = len(frame)
-    window = np.hanning(N)
-    xw = frame * window
-    nfft = 2 ** int(np.ceil(np.log2(N)))
+    xw, nfft, _ = windowed_frame(frame, sample_rate, remove_dc=False)
     spec = np.fft.rfft(xw, n=nfft)
     log_spec = np.log(np.abs(spec) + 1e-10)
     cepstrum = np.fft.irfft(log_spec)
@@ -1181,31 +1565,59 @@ def cepstrum_pitch(frame, sample_rate, fmin=50, fmax=1000):
     return pitch
 
 
+@functools.lru_cache(maxsize=16)
+def hps_setup(N, sample_rate, fmin, fmax, harmonics):
+    """
+    Returns the bin range searched by hps_pitch and, when every harmonic of those bins lies
+    inside the spectrum, the (harmonics x max_index) bin index matrix k * h used to build the
+    harmonic product in a single gather.
+
+    Args:
+        N (int): Frame length in samples.
+        sample_rate (int): The audio sample rate.
+        fmin (float): Minimum pitch considered.
+        fmax (float): Maximum pitch considered.
+        harmonics (int): Number of harmonics multiplied.
+
+    Returns:
+        tuple: (min_index (int), max_index (int), harmonic_bins (np.array or None)); the index
+               matrix is read-only, or None if the per-harmonic loop is needed.
+    """
+    _, _, freqs = spectral_setup(N, sample_rate)
+    # Find the maximum index corresponding to fmax
+    max_index = int(np.searchsorted(freqs, fmax))
+    if max_index == 0 or max_index > len(freqs):
+        max_index = len(freqs)
+    min_index = int(np.searchsorted(freqs, fmin))
+
+    harmonic_bins = None
+    if (max_index - 1) * harmonics < len(freqs):
+        harmonic_bins = np.arange(1, harmonics + 1)[:, None] * np.arange(max_index)[None, :]
+        harmonic_bins.setflags(write=False)
+    return min_index, max_index, harmonic_bins
+
+
 def hps_pitch(frame, sample_rate, fmin=50, fmax=1000, harmonics=4):
     """
     Harmonic Product Spectrum (HPS) pitch detection.
-    Uses np.searchsorted to quickly index into the spectrum and multiplies decimated versions.
+    Multiplies the spectrum by its decimated versions using a cached harmonic bin index matrix.
     """
-    frame = frame.astype(np.float32)
-    frame = frame - np.mean(frame)
-    N = len(frame)
-    window = np.hanning(N)
-    xw = frame * window
-    nfft = 2 ** int(np.ceil(np.log2(N)))
-    spectrum = np.abs(np.fft.rfft(xw, n=nfft))
-    freqs = np.fft.rfftfreq(nfft, 1.0 / sample_rate)
-
-    # Find the maximum index corresponding to fmax
-    max_index = np.searchsorted(freqs, fmax)
-    if max_index == 0 or max_index > len(spectrum):
-        max_index = len(spectrum)
+    xw, nfft, freqs = windowed_frame(frame, sample_rate)
+    # The product of squared magnitudes is the square of the magnitude product, so the HPS peak
+    # is the same and the per-bin sqrt can be skipped.
+    spec = np.fft.rfft(xw, n=nfft)
+    spectrum = spec.real ** 2 + spec.imag ** 2
 
-    hps_spec = spectrum[:max_index].copy()
-    for h in range(2, harmonics + 1):
-        decimated = spectrum[::h][:max_index]
-        hps_spec[:len(decimated)] *= decimated
+    min_index, max_index, harmonic_bins = hps_setup(len(xw), sample_rate, fmin, fmax, harmonics)
+    if harmonic_bins is not None:
+        # All harmonics of every bin below fmax are in range: one gather and one product.
+        hps_spec = spectrum[harmonic_bins].prod(axis=0)
+    else:
+        hps_spec = spectrum[:max_index].copy()
+        for h in range(2, harmonics + 1):
+            decimated = spectrum[::h][:max_index]
+            hps_spec[:len(decimated)] *= decimated
 
-    min_index = np.searchsorted(freqs, fmin)
     index = np.argmax(hps_spec[min_index:]) + min_index
     pitch = freqs[index]
     if pitch < fmin or pitch > fmax:
@@ -1227,6 +1639,35 @@ def hps_pitch(frame, sample_rate, fmin=50, fmax=1000, harmonics=4):
 
 
 
+# --------------------------- Helper Function for Querying Audio Devices ---------------------------
+# Host APIs whose input devices are offered in the device list, and the tag prefixed to their device
+# names (checked in order, against the upper-cased host API name).
+_LISTED_HOSTAPIS = ("ASIO", "MME", "WASAPI")
+_HOSTAPI_TAGS = (("ASIO", "[ASIO] "), ("WASAPI", "[WASAPI] "), ("WDM-KS", "[WDM-KS] "), ("MME", "[MME] "))
+
+_device_cache = {"time": float("-inf"), "devices": None, "hostapis": None}
+
+
+def query_audio_devices(refresh=False):
+    """
+    Returns the PortAudio device and host API lists, reusing the previous enumeration for
+    DEVICE_QUERY_CACHE_SECONDS. Querying PortAudio can block for a noticeable time on Windows
+    (driver probing), and device setup looks the lists up repeatedly.
+
+    Args:
+        refresh (bool): Query PortAudio even if the cached lists are still fresh.
+
+    Returns:
+        tuple: (devices, hostapis) as returned by sd.query_devices() and sd.query_hostapis().
+    """
+    now = time.monotonic()
+    if refresh or _device_cache["devices"] is None or now - _device_cache["time"] >= defaults.DEVICE_QUERY_CACHE_SECONDS:
+        _device_cache["devices"] = sd.query_devices()
+        _device_cache["hostapis"] = sd.query_hostapis()
+        _device_cache["time"] = now
+    return _device_cache["devices"], _device_cache["hostapis"]
+
+
 # --------------------------- Audio Stream Callback Handler ---------------------------
 class AudioStreamCallbackHandler:
     """
@@ -1237,7 +1678,7 @@ class AudioStreamCallbackHandler:
     def _try_open_stream(self, sample_rate, dtype):
         try:
             device_info = sd.query_devices(self.device_index)
-            hostapis = sd.query_hostapis()
+            _, hostapis = query_audio_devices()
             hostapi = hostapis[device_info['hostapi']]
 
             # Special handling for ASIO devices
@@ -1314,8 +1755,9 @@ class AudioStreamCallbackHandler:
         self.sample_rate = sample_rate
         self.block_size = block_size
         self.debug_callback = debug_callback
-        self.ring_buffer = np.empty((0,), dtype=np.float32)
-        self.mutex = QMutex()
+        self._allocate_ring(np.float32)
+        # Guards stream start/stop only; the callback and get_buffer never take it.
+        self.lock = threading.Lock()
         self.fallback_conversion = False
         self.stream = None
 
@@ -1354,6 +1796,7 @@ class AudioStreamCallbackHandler:
                 # Fallback: try int16.
                 self.dtype = "int16"
                 self.fallback_conversion = True
+                self._allocate_ring(np.int16)
                 try:
                     self.stream, self.sample_rate, self.dtype = self._try_open_stream(self.sample_rate, self.dtype)
                     self.debug_callback(f"Stream opened using int16 for device {self.device_index} at sample rate {self.sample_rate}; conversion enabled")
@@ -1389,7 +1832,7 @@ class AudioStreamCallbackHandler:
         if defaults.ENABLE_DEBUG:
             try:
                 device_info = sd.query_devices(self.device_index)
-                hostapis = sd.query_hostapis()
+                _, hostapis = query_audio_devices()
                 hostapi_name = hostapis[device_info['hostapi']]['name'] if device_info.get('hostapi') is not None else "Unknown"
                 detailed_msg = (
                     f"Detailed Stream Info:\n"
@@ -1404,56 +1847,148 @@ class AudioStreamCallbackHandler:
             except Exception as e:
                 self.debug_callback(f"Could not retrieve device info: {e}")
 
+    def _allocate_ring(self, dtype):
+        """
+        Allocates the single-producer/single-consumer ring shared by the audio callback (producer)
+        and get_buffer (consumer). Samples are stored in the stream's native dtype; int16 data is
+        only normalized on read.
+
+        head counts every sample ever written and is only advanced by the callback, after the
+        samples are in place; tail counts samples consumed and is only advanced by get_buffer.
+        The ring holds twice the REBUFFER_SIZE samples a read returns, so the producer cannot
+        overwrite a span while it is being copied out. Neither side needs a lock.
+
+        Args:
+            dtype (np.dtype): Sample type of the stream (float32 or int16).
+        """
+        self.capacity = 2 * defaults.REBUFFER_SIZE
+        self.ring_buffer = np.empty(self.capacity, dtype=dtype)
+        self.ring_buffer.fill(0)  # Touch every page now rather than on the callback's first writes.
+        if defaults.LOCK_AUDIO_BUFFER_PAGES:
+            self._lock_ring_pages()
+        self.head = 0         # Total samples written (producer only).
+        self.tail = 0         # Total samples consumed (consumer only).
+        self.wake_samples = 1 # Unread sample count at which the callback wakes the consumer.
+        self.data_ready = threading.Event()
+
+    def _lock_ring_pages(self):
+        """
+        Locks the ring buffer pages in physical memory so the realtime callback never takes a page
+        fault (or waits for a swapped-out page) while writing. Failures, e.g. a low RLIMIT_MEMLOCK,
+        are reported on the debug console and the ring simply stays pageable.
+        """
+        address = ctypes.c_void_p(self.ring_buffer.ctypes.data)
+        size = ctypes.c_size_t(self.ring_buffer.nbytes)
+        try:
+            if sys.platform == "win32":
+                if not ctypes.windll.kernel32.VirtualLock(address, size):
+                    raise ctypes.WinError()
+            else:
+                libc = ctypes.CDLL(None, use_errno=True)
+                if libc.mlock(address, size) != 0:
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, os.strerror(errno))
+        except Exception as e:
+            self.debug_callback(f"Could not lock audio ring buffer pages: {e}")
+
     def _callback(self, indata, frames, time, status):
         if status:
             # Only log overflow if debug is enabled to reduce spam
             if defaults.ENABLE_DEBUG and "overflow" in str(status):
                 self.debug_callback(f"Stream callback status: {status}")
 
-        # Copy the incoming data.
-        if self.fallback_conversion:
-            # Convert int16 data to float32 (normalized)
-            new_samples = indata.copy().astype(np.float32) / 32768.0
+        # Take the single input channel (stored as-is; int16 is converted in get_buffer).
+        new_samples = indata[:, 0]
+
+        n = len(new_samples)
+        capacity = self.capacity
+        if n > capacity:
+            # Keep only the most recent samples that will fit
+            new_samples = new_samples[-capacity:]
+            n = capacity
+
+        # Write into the preallocated ring, wrapping around the end if needed.
+        pos = self.head % capacity
+        end = pos + n
+        if end <= capacity:
+            np.copyto(self.ring_buffer[pos:end], new_samples)
         else:
-            new_samples = indata.copy()
-        new_samples = np.squeeze(new_samples)
+            first = capacity - pos
+            np.copyto(self.ring_buffer[pos:], new_samples[:first])
+            np.copyto(self.ring_buffer[:n - first], new_samples[first:])
+        # Publish the samples only once they are written
+        self.head += n
+        if self.head - self.tail >= self.wake_samples:
+            self.data_ready.set()
 
-        self.mutex.lock()
-        try:
-            # If buffer is getting too large, trim it
-            if len(self.ring_buffer) + len(new_samples) > defaults.REBUFFER_SIZE:
-                # Keep only the most recent samples that will fit
-                available_space = defaults.REBUFFER_SIZE - len(new_samples)
-                if available_space > 0:
-                    self.ring_buffer = self.ring_buffer[-available_space:]
-                else:
-                    self.ring_buffer = np.empty((0,), dtype=np.float32)
+    def get_buffer(self):
+        """
+        Retrieves and clears the ring buffer data.
 
-            self.ring_buffer = np.concatenate((self.ring_buffer, new_samples))
+        Returns:
+            np.array: The unread samples in chronological order (float32).
+        """
+        data = np.empty(defaults.REBUFFER_SIZE, dtype=np.float32)
+        return data[:self.read_into(data)]
 
-            # Ensure buffer never exceeds maximum size
-            if len(self.ring_buffer) > defaults.REBUFFER_SIZE:
-                self.ring_buffer = self.ring_buffer[-defaults.REBUFFER_SIZE:]
+    def read_into(self, out):
+        """
+        Moves the unread samples into a caller-owned buffer, converting int16 data on the way.
 
-        finally:
-            self.mutex.unlock()
+        Args:
+            out (np.array): float32 destination; at most len(out) (and REBUFFER_SIZE) of the
+                            newest samples are written, older unread samples are dropped.
 
-    def get_buffer(self):
+        Returns:
+            int: Number of samples written to out[:n].
         """
-        Retrieves and clears the ring buffer data.
+        # Snapshot the producer's position; samples written after this are left for the next read.
+        head = self.head
+        # Unread samples older than the most recent REBUFFER_SIZE are dropped (overflow)
+        n = min(head - self.tail, defaults.REBUFFER_SIZE, len(out))
+        start = (head - n) % self.capacity
+        data = out[:n]
+        # Copy (or convert) straight into the output, in one or two pieces around the wrap point.
+        if start + n <= self.capacity:
+            pieces = ((self.ring_buffer[start:start + n], data),)
+        else:
+            first = self.capacity - start
+            pieces = ((self.ring_buffer[start:], data[:first]),
+                      (self.ring_buffer[:n - first], data[first:]))
+        for src, dst in pieces:
+            if self.fallback_conversion:
+                # Convert int16 data to normalized float32 in a single pass
+                np.multiply(src, np.float32(1.0 / 32768.0), out=dst, dtype=np.float32)
+            else:
+                np.copyto(dst, src)
+        self.tail = head
+        return n
+
+    def wait_for_data(self, n, timeout):
         """
-        self.mutex.lock()
-        try:
-            data = self.ring_buffer.copy()
-            self.ring_buffer = np.empty((0,), dtype=np.float32)
-        finally:
-            self.mutex.unlock()
-        return data
+        Blocks the consumer until at least n unread samples are available, or the timeout expires.
+
+        Args:
+            n (int): Number of unread samples to wait for.
+            timeout (float): Maximum wait in seconds.
+
+        Returns:
+            bool: True if enough samples are available.
+        """
+        self.wake_samples = n
+        self.data_ready.clear()
+        # Re-check after clearing so a callback that published just before is not missed
+        if self.head - self.tail >= n:
+            return True
+        return self.data_ready.wait(timeout)
+
+    def clear(self):
+        """Discards any unread samples (e.g. audio captured while paused)."""
+        self.tail = self.head
 
     def stop(self):
         """Safely stop and clean up the audio stream."""
-        self.mutex.lock()
-        try:
+        with self.lock:
             if self.stream is not None:
                 try:
                     self.stream.stop()
@@ -1463,17 +1998,15 @@ class AudioStreamCallbackHandler:
                     self.stream.close()
                 except Exception as e:
                     self.debug_callback(f"Error closing stream: {e}")
-                self.stream = None
-        finally:
-            self.mutex.unlock()
+                self.stream = None
 
 
 # --------------------------- Audio Processing Thread ---------------------------
 class AudioStreamWorker(QThread):
     """
     QThread subclass that handles real-time audio capture and processing.
-    It reads audio frames, applies gain and pitch detection, and emits signals for
-    pitch updates, state changes, and VU meter updates.
+    It reads audio frames, applies gain and pitch detection, and publishes pitch updates,
+    state changes and VU meter levels (through event_queue/vu_levels or signals).
     """
     pitchDetected = Signal(float, float, float)  # Emits effective time, detected pitch, and post-gain RMS.
     stateChanged = Signal(float, bool)             # Emits effective time and pause state changes.
@@ -1499,7 +2032,7 @@ class AudioStreamWorker(QThread):
         #self.debugMessage = lambda msg: print(msg)
 
         # Initialization of other variables remains as before.
-        self._last_stats_emit = time.time()
+        self._last_stats_emit = time.monotonic()
         self.running = True
         self.auto_paused = False     # Auto-pause flag.
         self.user_paused = False     # User-initiated pause flag.
@@ -1525,20 +2058,71 @@ class AudioStreamWorker(QThread):
         self.last_pitch_event = None
         self.outlier_count = 0
         self.priority_set = False
+        self.pitch_fn = None
+        self._update_pitch_fn()
+        # Pitch/state events for the GUI; deque append/popleft are thread-safe, so no lock is needed.
+        self.event_queue = deque(maxlen=defaults.WORKER_EVENT_QUEUE_SIZE)
+        # Latest (pre-gain, post-gain) RMS pair for the GUI tick; replaced as one tuple, so no lock is needed.
+        self.vu_levels = None
+        self._last_emitted_levels = (0.0, 0.0)
+
+    def post_pitch(self, effective_time, pitch, rms):
+        """
+        Publishes a pitch event (pitch -1.0 marks a break) to the GUI, either through the
+        coalescing event queue or directly as a pitchDetected signal.
+        """
+        if defaults.COALESCE_WORKER_EVENTS:
+            self.event_queue.append(("pitch", effective_time, pitch, rms))
+        else:
+            self.pitchDetected.emit(effective_time, pitch, rms)
+
+    def post_levels(self, pre_gain_rms, post_gain_rms):
+        """
+        Publishes the VU meter levels of a block to the GUI. When coalescing, only the latest pair is
+        kept and read once per GUI tick; otherwise the signals are emitted only when a level changed
+        by more than VU_EMIT_MIN_CHANGE_DB.
+        """
+        if defaults.COALESCE_WORKER_EVENTS:
+            self.vu_levels = (pre_gain_rms, post_gain_rms)
+            return
+        # Skip the signals while neither level moved perceptibly since the last emission.
+        tolerance = 10 ** (defaults.VU_EMIT_MIN_CHANGE_DB / 20.0) - 1.0
+        last_pre, last_post = self._last_emitted_levels
+        if (abs(pre_gain_rms - last_pre) <= tolerance * last_pre
+                and abs(post_gain_rms - last_post) <= tolerance * last_post):
+            return
+        self._last_emitted_levels = (pre_gain_rms, post_gain_rms)
+        self.vuMeterUpdate.emit(pre_gain_rms)
+        self.vuMeterPostUpdate.emit(post_gain_rms)
+
+    def post_state(self, effective_time, paused):
+        """
+        Publishes a pause state change to the GUI, keeping it ordered with the pitch events.
+        """
+        if defaults.COALESCE_WORKER_EVENTS:
+            self.event_queue.append(("state", effective_time, paused))
+        else:
+            self.stateChanged.emit(effective_time, paused)
 
     # --- New method to replace the callback handler when changing devices ---
     def replace_callback_handler(self, new_handler):
+        """
+        Swaps in a new callback handler. The worker loads self.callback_handler once per iteration,
+        so the swap is a single reference assignment; the old stream is stopped after the mutex is
+        released so closing it never stalls the worker's pause check.
+        """
         self.mutex.lock()
         try:
-            if self.callback_handler is not None:
-                self.callback_handler.stop()
-            self.callback_handler = new_handler
+            old_handler = self.callback_handler
             self.device_index = new_handler.device_index
             self.sample_rate = new_handler.sample_rate
             self.chunk_size = new_handler.block_size
             self.current_stream_sample_rate = new_handler.sample_rate
+            self.callback_handler = new_handler
         finally:
             self.mutex.unlock()
+        if old_handler is not None:
+            old_handler.stop()
 
     def set_boost_mode(self, mode):
         """
@@ -1551,6 +2135,7 @@ class AudioStreamWorker(QThread):
         Enable or disable extra sensitivity for the pitch detection algorithm.
         """
         self.extra_sensitivity = mode
+        self._update_pitch_fn()
 
     # --- Modified set_pitch_method: now it updates the processing chunk size ---
     def set_pitch_method(self, method):
@@ -1559,6 +2144,32 @@ class AudioStreamWorker(QThread):
         For the PYIN method, the block size is doubled compared to the default.
         """
         self.pitch_method = method
+        self._update_pitch_fn()
+
+    def _update_pitch_fn(self):
+        """
+        Binds the detector for the current method (with its fmin/fmax and, for YIN, the threshold
+        for the sensitivity mode) once, so the per-block loop calls it directly instead of walking
+        an if/elif chain of string compares. Unknown methods leave pitch_fn as None (no pitch).
+        """
+        fmin, fmax = defaults._FMIN, defaults._FMAX
+        if self.pitch_method == "YIN":
+            th = defaults.YIN_DEFAULT_THRESHOLD
+            if self.extra_sensitivity:
+                th = defaults.YIN_SENSITIVE_THRESHOLD
+            self.pitch_fn = functools.partial(yin_pitch, threshold=th)
+        elif self.pitch_method == "PYIN":
+            self.pitch_fn = functools.partial(pyin_pitch, fmin=fmin, fmax=fmax,
+                                              debug_callback=self.debugMessage.emit)
+        else:
+            detector = {
+                "Autocorrelation": autocorrelation_pitch,
+                "MPM": mpm_pitch,
+                "SWIPE": swipe_pitch,
+                "Cepstrum": cepstrum_pitch,
+                "HPS": hps_pitch,
+            }.get(self.pitch_method)
+            self.pitch_fn = functools.partial(detector, fmin=fmin, fmax=fmax) if detector else None
 
     def apply_pitch_smoothing(self, new_pitch):
         """
@@ -1566,27 +2177,31 @@ class AudioStreamWorker(QThread):
         If the new pitch is less than SMOOTHING_THRESHOLD_RATIO of the previous pitch, count outlier frames.
         For fewer than SMOOTHING_COUNT_THRESHOLD consecutive outlier frames, return the previous (higher) pitch.
         If the condition persists for that many frames, allow the new pitch and reset the counter.
+        The per-frame debug messages are only built when ENABLE_DEBUG is set.
         """
         if not defaults.SMOOTHING_ENABLED:
             return new_pitch
 
-        if self.last_pitch_event is not None and self.last_pitch_event[1] > 0:
-            previous_pitch = self.last_pitch_event[1]
-            if new_pitch < previous_pitch * defaults.SMOOTHING_THRESHOLD_RATIO:
-                self.outlier_count += 1
-                if self.outlier_count < defaults.SMOOTHING_COUNT_THRESHOLD:
-                    self.debugMessage.emit(
-                        f"Outlier pitch detected: previous {previous_pitch:.2f} Hz, current {new_pitch:.2f} Hz. Smoothing applied (count: {self.outlier_count})."
-                    )
-                    return previous_pitch
-                else:
-                    self.debugMessage.emit(
-                        f"Outlier condition persisted for {self.outlier_count} frames. Updating pitch to new value: {new_pitch:.2f} Hz."
-                    )
-                    self.outlier_count = 0
-                    return new_pitch
-            else:
-                self.outlier_count = 0
+        last_event = self.last_pitch_event
+        if last_event is None or last_event[1] <= 0:
+            return new_pitch
+        previous_pitch = last_event[1]
+        if new_pitch >= previous_pitch * defaults.SMOOTHING_THRESHOLD_RATIO:
+            self.outlier_count = 0
+            return new_pitch
+
+        self.outlier_count += 1
+        if self.outlier_count < defaults.SMOOTHING_COUNT_THRESHOLD:
+            if defaults.ENABLE_DEBUG:
+                self.debugMessage.emit(
+                    f"Outlier pitch detected: previous {previous_pitch:.2f} Hz, current {new_pitch:.2f} Hz. Smoothing applied (count: {self.outlier_count})."
+                )
+            return previous_pitch
+        if defaults.ENABLE_DEBUG:
+            self.debugMessage.emit(
+                f"Outlier condition persisted for {self.outlier_count} frames. Updating pitch to new value: {new_pitch:.2f} Hz."
+            )
+        self.outlier_count = 0
         return new_pitch
 
     def run(self):
@@ -1600,16 +2215,22 @@ class AudioStreamWorker(QThread):
                 self.priority_set = True
             except Exception as e:
                 self.debugMessage.emit(f"Could not set thread priority: {e}")
+        mmcss_handle = self._set_realtime_scheduling() if defaults.ENABLE_REALTIME_THREAD_PRIORITY else None
 
         # Add overflow counter
         overflow_count = 0
-        last_overflow_time = time.time()
+        last_overflow_time = time.monotonic()
 
         loop_count = 0
-        last_fps_time = time.time()
+        last_fps_time = time.monotonic()
         current_loop_rate = 0.0
-        # Persistent rebuffer array (empty initially, float32 normalized values)
-        rebuffer = np.empty((0,), dtype=np.float32)
+        # Persistent preallocated rebuffer (float32 normalized values). Unprocessed samples live in
+        # rebuffer[rebuffer_start:rebuffer_start + rebuffer_len]; the spare half means they only
+        # need to be moved back to the front occasionally instead of reallocating on every read.
+        rebuffer = np.zeros(2 * defaults.REBUFFER_SIZE, dtype=np.float32)
+        rebuffer_start = 0
+        rebuffer_len = 0
+        gain_frame = np.empty(0, dtype=np.float32)  # Scratch for the gained frame passed to the detectors
         total_samples_read = 0  # Total samples read from the stream
         processed_samples = 0   # Total samples processed for pitch detection timing
         last_block_time = 0  # Add tracking of last block time
@@ -1618,7 +2239,8 @@ class AudioStreamWorker(QThread):
 
         while self.running:
 
-            iteration_start = time.time()
+            # One monotonic clock read per iteration, shared by the overflow, loop-rate and stats logic.
+            iteration_start = time.monotonic()
 
             # --- Check for manual pause and wait until resumed ---
             self.mutex.lock()
@@ -1629,106 +2251,116 @@ class AudioStreamWorker(QThread):
             self.mutex.unlock()
             # --- End of new pause check code ---
 
-            # Get new samples from the callback handler's ring buffer.
-            if self.callback_handler is None:
+            # Get new samples from the callback handler's ring buffer. The handler reference is loaded
+            # once, so a concurrent replace_callback_handler() takes effect from the next iteration.
+            handler = self.callback_handler
+            if handler is None:
                 self.msleep(5)
                 continue
-            new_samples = self.callback_handler.get_buffer()
-
-            # Handle potential overflow
-            current_time = time.time()
-            if len(new_samples) >= defaults.REBUFFER_SIZE:
+            # Make room for a full read behind the unprocessed samples, then let the handler copy
+            # straight into the rebuffer (no intermediate array per iteration).
+            if rebuffer_start + rebuffer_len + defaults.REBUFFER_SIZE > len(rebuffer):
+                np.copyto(rebuffer[:rebuffer_len], rebuffer[rebuffer_start:rebuffer_start + rebuffer_len])
+                rebuffer_start = 0
+            write_at = rebuffer_start + rebuffer_len
+            n_new = handler.read_into(rebuffer[write_at:write_at + defaults.REBUFFER_SIZE])
+
+            # Handle potential overflow (read_into already keeps only the newest REBUFFER_SIZE samples)
+            if n_new >= defaults.REBUFFER_SIZE:
                 overflow_count += 1
-                if current_time - last_overflow_time >= 5.0:
+                if iteration_start - last_overflow_time >= 5.0:
                     self.debugMessage.emit(f"Buffer overflow occurred {overflow_count} times in last 5 seconds")
                     overflow_count = 0
-                    last_overflow_time = current_time
-                # Trim excess samples to prevent cascading overflow
-                new_samples = new_samples[-defaults.REBUFFER_SIZE:]
+                    last_overflow_time = iteration_start
 
-            if len(new_samples) == 0:
-                self.msleep(5)
+            if n_new == 0:
+                handler.wait_for_data(max(1, self.chunk_size - rebuffer_len),
+                                      1.0 / defaults.MAX_AUDIO_WORKER_LOOP_HZ)
                 continue
 
-            # Append the new samples to the rebuffer.
-            rebuffer = np.concatenate((rebuffer, new_samples))
-            # Trim the ring buffer to REBUFFER_SIZE if necessary
-            if len(rebuffer) > defaults.REBUFFER_SIZE:
-                rebuffer = rebuffer[-defaults.REBUFFER_SIZE:]
+            # Trim the oldest samples so at most REBUFFER_SIZE remain
+            rebuffer_len += n_new
+            excess = rebuffer_len - defaults.REBUFFER_SIZE
+            if excess > 0:
+                rebuffer_start += excess
+                rebuffer_len -= excess
 
             # Update total_samples_read and effective time (for scrolling)
-            total_samples_read += len(new_samples)
+            total_samples_read += n_new
             # Use current_stream_sample_rate for all time computations:
             self.effective_time = total_samples_read / self.current_stream_sample_rate
 
-#            self.statsText.emit(f"""Ch:{self.chunk_size} Bu:{len(new_samples)}<br>
-#                                    RB:{len(rebuffer)}/{defaults.REBUFFER_SIZE},<br>
+#            self.statsText.emit(f"""Ch:{self.chunk_size} Bu:{n_new}<br>
+#                                    RB:{rebuffer_len}/{defaults.REBUFFER_SIZE},<br>
 #                                    Eff. Time: {self.effective_time:.01f} s,<br>
 #                                    Loop Rate: {current_loop_rate:.1f} Hz""")
 
+            # Snapshot the per-block settings once per read (setters take effect from the next read)
+            # so the block loop works on locals instead of repeated attribute lookups.
+            chunk = self.chunk_size
+            sample_rate = self.current_stream_sample_rate
+            dt_block = chunk / sample_rate
+
+            # Compute effective gain.
+            effective_gain = self.gain
+            #effective_gain = self.gain * (4 if self.boost_mode else 1)
+            #if self.callback_handler.dtype == 'float32' and not getattr(self, "is_wasapi", False):
+            if handler.dtype == 'float32':
+                extra_multiplier = 1   # For example, try lowering the multiplier.
+                effective_gain *= extra_multiplier
+            gain_scale = abs(effective_gain)
+            effective_gain = np.float32(effective_gain)  # Keep the gain multiply a pure float32 loop
+
+            # Adjust noise threshold using the value calculated from sensitivity.
+            adjusted_threshold = self.noise_threshold
+            pitch_fn = self.pitch_fn
+
+            # Down-sample before detection; the detectors only need the fundamental range.
+            detection_rate = sample_rate
+            decimation = int(defaults.DETECTION_DECIMATION)
+            if decimation <= 1 or sample_rate / decimation < 4 * defaults._FMAX:
+                decimation = 1
+            else:
+                detection_rate = sample_rate / decimation
+
+            if len(gain_frame) != chunk:
+                gain_frame = np.empty(chunk, dtype=np.float32)
+
             # Process full blocks from the rebuffer
-            while len(rebuffer) >= self.chunk_size:
+            while rebuffer_len >= chunk:
 
                 # Extract one block of CHUNK_SIZE samples.
-                current_frame = rebuffer[:self.chunk_size]
-                rebuffer = rebuffer[self.chunk_size:]
+                current_frame = rebuffer[rebuffer_start:rebuffer_start + chunk]
+                rebuffer_start += chunk
+                rebuffer_len -= chunk
 
                 # Update processed samples and compute block time.
-                processed_samples += self.chunk_size
-                block_time = processed_samples / self.current_stream_sample_rate
+                processed_samples += chunk
+                block_time = processed_samples / sample_rate
 
                 # Ensure monotonic time progression
                 if block_time <= last_block_time:
-                    block_time = last_block_time + (self.chunk_size / self.current_stream_sample_rate)
+                    block_time = last_block_time + dt_block
                 last_block_time = block_time
 
-                # Compute pre-gain RMS for VU meter update.
-                pre_gain_rms = np.sqrt(np.mean(current_frame ** 2))
-                self.vuMeterUpdate.emit(pre_gain_rms)
-
-                # Compute effective gain.
-                effective_gain = self.gain
-                #effective_gain = self.gain * (4 if self.boost_mode else 1)
-                #if self.callback_handler.dtype == 'float32' and not getattr(self, "is_wasapi", False):
-                if self.callback_handler.dtype == 'float32':
-                    extra_multiplier = 1   # For example, try lowering the multiplier.
-                    effective_gain *= extra_multiplier
+                # Compute pre-gain RMS for VU meter update (one dot product, no squared temporary).
+                pre_gain_rms = math.sqrt(float(np.dot(current_frame, current_frame)) / chunk)
 
-                # Apply gain and calculate post-gain RMS.
-                audio_frame = current_frame * effective_gain
-                post_gain_rms = np.sqrt(np.mean(audio_frame ** 2))
-                self.vuMeterPostUpdate.emit(post_gain_rms)
-
-                # Adjust noise threshold using the value calculated from sensitivity.
-                adjusted_threshold = self.noise_threshold
+                # The post-gain RMS is the pre-gain RMS scaled by the gain, so the gained frame is
+                # only materialized below for frames that pass the noise gate.
+                post_gain_rms = pre_gain_rms * gain_scale
+                self.post_levels(pre_gain_rms, post_gain_rms)
 
                 # Determine pitch.
-                if post_gain_rms < adjusted_threshold:
+                if post_gain_rms < adjusted_threshold or pitch_fn is None:
                     pitch = 0.0
                 else:
-                    if self.pitch_method == "YIN":
-                        th = defaults.YIN_DEFAULT_THRESHOLD
-                        if self.extra_sensitivity:
-                            th = defaults.YIN_SENSITIVE_THRESHOLD
-                        pitch = yin_pitch(audio_frame, self.current_stream_sample_rate, threshold=th)
-                    elif self.pitch_method == "Autocorrelation":
-                        pitch = autocorrelation_pitch(audio_frame, self.current_stream_sample_rate, fmin=defaults._FMIN, fmax=defaults._FMAX)
-                    elif self.pitch_method == "MPM":
-                        pitch = mpm_pitch(audio_frame, self.current_stream_sample_rate, fmin=defaults._FMIN, fmax=defaults._FMAX)
-                    elif self.pitch_method == "SWIPE":
-                        pitch = swipe_pitch(audio_frame, self.current_stream_sample_rate, fmin=defaults._FMIN, fmax=defaults._FMAX)
-                    elif self.pitch_method == "Cepstrum":
-                        pitch = cepstrum_pitch(audio_frame, self.current_stream_sample_rate, fmin=defaults._FMIN, fmax=defaults._FMAX)
-                    elif self.pitch_method == "PYIN":
-                        pitch = pyin_pitch(audio_frame, self.current_stream_sample_rate,
-                                          fmin=defaults._FMIN, fmax=defaults._FMAX,
-                                          debug_callback=self.debugMessage.emit)
-                    elif self.pitch_method == "HPS":
-                        pitch = hps_pitch(audio_frame, self.current_stream_sample_rate, fmin=defaults._FMIN, fmax=defaults._FMAX)
-                    else:
-                        pitch = 0.0
+                    # Apply gain into the worker-owned scratch frame (no allocation per block).
+                    audio_frame = np.multiply(current_frame, effective_gain, out=gain_frame)
+                    if decimation > 1:
+                        audio_frame = decimate_frame(audio_frame, decimation)
+                    pitch = pitch_fn(audio_frame, detection_rate)
 
-                dt_block = self.chunk_size / self.current_stream_sample_rate
 
                 # Update silent duration and manage auto pause/resume using the block time.
                 if not self.user_paused:
@@ -1755,7 +2387,7 @@ class AudioStreamWorker(QThread):
                                 #self.pause_start_time = self.effective_time - defaults.SILENT_DURATION
                                 self.pause_start_time = self.effective_time - self.paused_time - self.silent_duration
 
-                            self.stateChanged.emit(self.pause_start_time, True)
+                            self.post_state(self.pause_start_time, True)
 
                             # Instead of emitting a break event (-1.0), re-emit the last valid pitch so that
                             # the highlighted horizontal line remains visible on pause.
@@ -1775,7 +2407,7 @@ class AudioStreamWorker(QThread):
                             #self.paused_time = self.effective_time - self.pause_start_time
                             self.just_resumed = True
                             #drawn_time = self.effective_time - self.paused_time - self.silent_duration
-                            self.stateChanged.emit(drawn_time, False)
+                            self.post_state(drawn_time, False)
 
 
                         if self.auto_paused:
@@ -1793,28 +2425,26 @@ class AudioStreamWorker(QThread):
                 if not self.paused and not self.auto_paused:
                     resume_time = self.effective_time - self.paused_time + defaults.SILENT_DURATION
                     if self.just_resumed:
-                        self.pitchDetected.emit(resume_time, -1.0, 0)
+                        self.post_pitch(resume_time, -1.0, 0)
                         self.just_resumed = False
                     else:
                         if pitch > 0:
                             # Apply smoothing for all pitch detection methods
                             pitch = self.apply_pitch_smoothing(pitch)
                             self.last_pitch_event = (resume_time, pitch, post_gain_rms)
-                            self.pitchDetected.emit(resume_time, pitch, post_gain_rms)
+                            self.post_pitch(resume_time, pitch, post_gain_rms)
                         else:
-                            self.pitchDetected.emit(resume_time, -1.0, 0)
+                            self.post_pitch(resume_time, -1.0, 0)
 
                 #else:
                 #    self.msleep(10)
 
 
 
-            iteration_duration = time.time() - last_fps_time
             desired_period = 1.0 / defaults.MAX_AUDIO_WORKER_LOOP_HZ
-            sleep_time = max(0.001, desired_period - iteration_duration)
-            #sleep_time = desired_period - iteration_duration
-            #if sleep_time <= 0.001: sleep_time = 0.001
-            time.sleep(sleep_time)
+            # Wait until the callback has published enough samples for the next full chunk instead of
+            # sleeping blindly; the timeout keeps pause/stop requests and the stats responsive.
+            handler.wait_for_data(max(1, self.chunk_size - rebuffer_len), desired_period)
 
             # start new iteration and measure frequency
             loop_count += 1
@@ -1824,22 +2454,54 @@ class AudioStreamWorker(QThread):
                 last_fps_time = iteration_start
 
 
-            if defaults.ENABLE_DEBUG:
-                current_time = time.time()
-                if current_time - self._last_stats_emit >= 0.5:
+            # Only build the stats text when debug is on and something is connected to statsText.
+            if defaults.ENABLE_DEBUG and iteration_start - self._last_stats_emit >= 0.5:
+                if self.receivers(SIGNAL("statsText(QString)")) > 0:
                     self.statsText.emit(f"""
-                        Ch: {self.chunk_size} Bu: {len(new_samples)}<br>
-                        RB: {len(rebuffer)}/{defaults.REBUFFER_SIZE}<br>
+                        Ch: {self.chunk_size} Bu: {n_new}<br>
+                        RB: {rebuffer_len}/{defaults.REBUFFER_SIZE}<br>
                         E/D: {self.effective_time:.01f}/{drawn_time:.01f}<br>
                         WorkerRate: {current_loop_rate:.1f}Hz
                         """)
-                    self._last_stats_emit = current_time
+                self._last_stats_emit = iteration_start
 
 
         if self.callback_handler is not None:
             self.callback_handler.stop()
 
+        if mmcss_handle:
+            try:
+                ctypes.windll.avrt.AvRevertMmThreadCharacteristics(ctypes.c_void_p(mmcss_handle))
+            except Exception as e:
+                self.debugMessage.emit(f"Could not revert MMCSS thread characteristics: {e}")
+
+    def _set_realtime_scheduling(self):
+        """
+        Requests OS realtime scheduling for the calling (worker) thread. Qt's TimeCriticalPriority
+        only adjusts the normal priority class; on Windows the thread is registered with MMCSS as a
+        "Pro Audio" task and on Linux SCHED_FIFO is requested (needs CAP_SYS_NICE or rtprio limits).
+        Failures are reported on the debug console and the thread keeps its normal priority.
 
+        Returns:
+            int: The MMCSS task handle to revert when the thread exits (Windows), otherwise None.
+        """
+        try:
+            if sys.platform == "win32":
+                avrt = ctypes.windll.avrt
+                avrt.AvSetMmThreadCharacteristicsW.restype = ctypes.c_void_p
+                avrt.AvSetMmThreadCharacteristicsW.argtypes = (ctypes.c_wchar_p, ctypes.POINTER(ctypes.c_ulong))
+                task_index = ctypes.c_ulong(0)
+                handle = avrt.AvSetMmThreadCharacteristicsW("Pro Audio", ctypes.byref(task_index))
+                if not handle:
+                    raise OSError(ctypes.get_last_error() or "AvSetMmThreadCharacteristicsW failed")
+                self.debugMessage.emit("Audio worker registered with MMCSS (Pro Audio)")
+                return handle
+            if hasattr(os, "sched_setscheduler"):
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(defaults.REALTIME_THREAD_PRIORITY))
+                self.debugMessage.emit(f"Audio worker using SCHED_FIFO priority {defaults.REALTIME_THREAD_PRIORITY}")
+        except Exception as e:
+            self.debugMessage.emit(f"Could not set realtime scheduling: {e}")
+        return None
 
     def pause(self):
         """
@@ -1858,16 +2520,14 @@ class AudioStreamWorker(QThread):
         self.auto_paused = False
         # --- Flush the ring buffer to ignore accumulated samples during pause ---
         if self.callback_handler is not None:
-            self.callback_handler.mutex.lock()
-            self.callback_handler.ring_buffer = np.empty((0,), dtype=np.float32)
-            self.callback_handler.mutex.unlock()
+            self.callback_handler.clear()
         # --- End flush code ---
         self.mutex.unlock()
-        self.stateChanged.emit(self.pause_start_time - self.paused_time, True)
+        self.post_state(self.pause_start_time - self.paused_time, True)
         # Re-emit the last valid pitch event using the frozen time so that the Piano Roll remains in place.
         if self.last_pitch_event is not None and self.last_pitch_event[1] > 0:
             current_time = self.pause_start_time - self.paused_time
-            self.pitchDetected.emit(current_time, self.last_pitch_event[1], self.last_pitch_event[2])
+            self.post_pitch(current_time, self.last_pitch_event[1], self.last_pitch_event[2])
 
     def resume(self):
         """
@@ -1878,15 +2538,13 @@ class AudioStreamWorker(QThread):
         self.paused = False
         # --- Added code to flush the ring buffer to remove audio captured during the pause ---
         if self.callback_handler is not None:
-            self.callback_handler.mutex.lock()
-            self.callback_handler.ring_buffer = np.empty((0,), dtype=np.float32)
-            self.callback_handler.mutex.unlock()
+            self.callback_handler.clear()
         # --- End added code ---
         self.paused_time += (self.effective_time - self.pause_start_time)  # Add pause duration to total
         self.silent_duration = 0.0
         self.pause_condition.wakeAll()
         self.mutex.unlock()
-        self.stateChanged.emit(self.effective_time - self.paused_time, False)
+        self.post_state(self.effective_time - self.paused_time, False)
 
     def set_sensitivity(self, value):
         """
@@ -1928,7 +2586,7 @@ class AudioStreamWorker(QThread):
             # For ASIO devices, use the device's default sample rate instead of defaults.SAMPLE_RATE
             try:
                 device_info = sd.query_devices(self.device_index)
-                hostapis = sd.query_hostapis()
+                _, hostapis = query_audio_devices()
                 hostapi_name = hostapis[device_info['hostapi']]['name']
                 if "ASIO" in hostapi_name.upper():
                     self.sample_rate = float(device_info.get("default_samplerate", defaults.SAMPLE_RATE))
@@ -1957,7 +2615,7 @@ class AudioStreamWorker(QThread):
         if defaults.ENABLE_DEBUG:
             try:
                 device_info = sd.query_devices(self.device_index)
-                hostapis = sd.query_hostapis()
+                _, hostapis = query_audio_devices()
                 hostapi_name = hostapis[device_info['hostapi']]['name'] if device_info.get('hostapi') is not None else "Unknown"
                 msg = (
                     f"Stream Info:\n"
@@ -1986,7 +2644,7 @@ class AudioStreamWorker(QThread):
             if defaults.ENABLE_DEBUG:
                 try:
                     device_info = sd.query_devices(self.device_index)
-                    hostapis = sd.query_hostapis()
+                    _, hostapis = query_audio_devices()
                     hostapi_name = hostapis[device_info['hostapi']]['name'] if device_info.get('hostapi') is not None else "Unknown"
                     msg = (
                         f"Stream Info:\n"
@@ -2047,12 +2705,20 @@ class PianoRollWidget(QOpenGLWidget):
         self.padding = defaults.DEFAULT_PADDING
         self.vert_padding = defaults.DEFAULT_VERT_PADDING  # Use vertical padding from defaults
         self.right_margin = defaults.DEFAULT_RIGHT_MARGIN
-        self.points = []
-        self.markers = []
+        # Pitch-line samples as parallel arrays (breaks have a NaN pitch), see _allocate_points().
+        self._allocate_points(defaults.PIANO_ROLL_POINT_CAPACITY)
+        self.markers = deque()  # Pause markers in time order; expired ones are popped from the left
         self.latest_time = 0.0
         self.scroll_speed = defaults.DEFAULT_SCROLL_SPEED
+        # Repaints are driven by the frame timer; frames whose data did not change are skipped,
+        # apart from a slow idle refresh that picks up settings changes. VU-only changes (e.g. while
+        # auto-paused) repaint at a reduced rate.
+        self._dirty = True
+        self._vu_dirty = False
+        self._since_paint = QElapsedTimer()
+        self._since_paint.start()
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update)
+        self.timer.timeout.connect(self._on_frame_timer)
         update_interval = int(1000 / defaults.DEFAULT_PIANO_ROLL_UPDATE_FPS)
         self.timer.start(update_interval)
         self.cents = 0
@@ -2061,6 +2727,61 @@ class PianoRollWidget(QOpenGLWidget):
         self.pr_last_time = time.time()
         self.pr_update_count = 0
         self.pr_fps = 0.0
+        # Cached static grid layer (background, scale lines and note labels)
+        self._grid_cache = None
+        self._grid_cache_key = None
+        # Pens and fonts used by paintGL, rebuilt only when their defaults change
+        self._paint_style_key = None
+
+    def _on_frame_timer(self):
+        """
+        Requests a repaint when new data arrived since the last frame, when only the VU levels changed
+        and PIANO_ROLL_VU_REPAINT_MS has elapsed, or when the idle refresh interval has elapsed.
+        """
+        elapsed = self._since_paint.elapsed()
+        if (self._dirty or (self._vu_dirty and elapsed >= defaults.PIANO_ROLL_VU_REPAINT_MS)
+                or elapsed >= defaults.PIANO_ROLL_IDLE_REPAINT_MS):
+            self.update()
+
+    def _allocate_points(self, capacity):
+        """
+        Allocates the pitch-line sample storage: parallel time, pitch, cents and label arrays whose
+        live samples are [_points_start, _points_end). Expired samples are dropped by advancing
+        _points_start, so neither adding nor expiring samples allocates per point.
+
+        Args:
+            capacity (int): Number of samples the arrays can hold before they are compacted or grown.
+        """
+        self._point_time = np.empty(capacity, dtype=np.float64)
+        self._point_pitch = np.empty(capacity, dtype=np.float64)
+        self._point_cents = np.zeros(capacity, dtype=np.int16)
+        self._point_label = np.empty(capacity, dtype=object)
+        self._points_start = 0
+        self._points_end = 0
+
+    def _append_point(self, time_stamp, pitch, label, cents):
+        """
+        Appends one pitch-line sample; a NaN pitch marks a break in the line.
+        """
+        if self._points_end == len(self._point_time):
+            # Move the live samples back to the front, growing the arrays if they are over half full.
+            start, end = self._points_start, self._points_end
+            count = end - start
+            arrays = (self._point_time, self._point_pitch, self._point_cents, self._point_label)
+            if count > len(self._point_time) // 2:
+                self._allocate_points(2 * len(self._point_time))
+            new_arrays = (self._point_time, self._point_pitch, self._point_cents, self._point_label)
+            for old, new in zip(arrays, new_arrays):
+                np.copyto(new[:count], old[start:end])
+            self._point_label[count:] = None  # Release labels of dropped samples
+            self._points_start = 0
+            self._points_end = count
+        i = self._points_end
+        self._point_time[i] = time_stamp
+        self._point_pitch[i] = pitch
+        self._point_cents[i] = cents
+        self._point_label[i] = label
+        self._points_end = i + 1
 
     def add_pitch_point(self, time_stamp, pitch, label, cents):
         """
@@ -2069,29 +2790,18 @@ class PianoRollWidget(QOpenGLWidget):
         # Minimum time difference between points (in seconds)
         MIN_TIME_DELTA = 0.01  # 10ms
 
-        if self.points:
-            last_point = self.points[-1]
-            # Only add point if enough time has passed or it's a different pitch
-            if (time_stamp - last_point['time'] >= MIN_TIME_DELTA or
-                (pitch != last_point.get('pitch') and pitch is not None)):
-                self.points.append({
-                    'time': time_stamp,
-                    'pitch': pitch,
-                    'label': label,
-                    'cents': cents
-                })
-        else:
-            # Always add the first point
-            self.points.append({
-                'time': time_stamp,
-                'pitch': pitch,
-                'label': label,
-                'cents': cents
-            })
+        last = self._points_end - 1
+        # Always add the first point; afterwards only if enough time has passed or it's a different
+        # pitch (a NaN break never compares equal).
+        if (last < self._points_start or
+                time_stamp - self._point_time[last] >= MIN_TIME_DELTA or
+                (pitch != self._point_pitch[last] and pitch is not None)):
+            self._append_point(time_stamp, pitch, label, cents)
 
         self.cents = cents
         if time_stamp > self.latest_time:
             self.latest_time = time_stamp
+        self._dirty = True
         if defaults.ENABLE_FORCED_PIANOROLL_UPDATE:
             self.update()
 
@@ -2099,9 +2809,10 @@ class PianoRollWidget(QOpenGLWidget):
         """
         Insert a break in the drawn pitch line (when pitch detection pauses).
         """
-        self.points.append({'time': time_stamp, 'pitch': None})
+        self._append_point(time_stamp, np.nan, None, 0)
         if time_stamp > self.latest_time:
             self.latest_time = time_stamp
+        self._dirty = True
         if defaults.ENABLE_FORCED_PIANOROLL_UPDATE: self.update()
 
     def add_marker(self, time_stamp, paused):
@@ -2113,9 +2824,20 @@ class PianoRollWidget(QOpenGLWidget):
 
         if time_stamp > self.latest_time:
             self.latest_time = time_stamp
+        self._dirty = True
 
         if defaults.ENABLE_FORCED_PIANOROLL_UPDATE: self.update()
 
+    def advance_time(self, time_stamp):
+        """
+        Scroll the piano roll forward to time_stamp without adding a point (silence while not auto-paused).
+        The repaint is left to the frame timer.
+        """
+        if time_stamp > self.latest_time:
+            self.latest_time = time_stamp
+            self._dirty = True
+            if defaults.ENABLE_FORCED_PIANOROLL_UPDATE: self.update()
+
     def set_scroll_speed(self, speed):
         """
         Update the scrolling speed of the piano roll.
@@ -2124,6 +2846,7 @@ class PianoRollWidget(QOpenGLWidget):
             speed (int): New scroll speed in pixels per second.
         """
         self.scroll_speed = speed
+        self._dirty = True
 
     def update_vu_meter(self, value):
         """
@@ -2132,7 +2855,9 @@ class PianoRollWidget(QOpenGLWidget):
         Args:
             value (float): The new pre-gain RMS value.
         """
-        self.vu_level_pre = value
+        if value != self.vu_level_pre:
+            self.vu_level_pre = value
+            self._vu_dirty = True
         if defaults.ENABLE_FORCED_PIANOROLL_UPDATE: self.update()
 
     def update_vu_meter_post(self, value):
@@ -2142,55 +2867,112 @@ class PianoRollWidget(QOpenGLWidget):
         Args:
             value (float): The new post-gain RMS value.
         """
-        self.vu_level_post = value
+        if value != self.vu_level_post:
+            self.vu_level_post = value
+            self._vu_dirty = True
         if defaults.ENABLE_FORCED_PIANOROLL_UPDATE: self.update()
 
-    def paintGL(self):
+    def _get_grid_cache_key(self, rect, prefer_sharps_local):
         """
-        OpenGL-accelerated painting of the piano roll.
-        This replaces the old paintEvent method.
+        Returns a tuple of every input the static grid layer depends on.
         """
-        current_time = time.time()
-        self.pr_update_count += 1
-        if current_time - self.pr_last_time >= 1.0:
-            self.pr_fps = self.pr_update_count / (current_time - self.pr_last_time)
-            self.pr_update_count = 0
-            self.pr_last_time = current_time
+        return (rect.width(), rect.height(), self.devicePixelRatioF(),
+                defaults.current_scale, defaults.current_root_note, prefer_sharps_local,
+                defaults.PITCH_LABEL_SOLFEGE, defaults.PITCH_LABEL_LETTERS, defaults.PITCH_LABEL_OCTAVE,
+                defaults.MIDI_START, defaults.MIDI_END,
+                defaults.COLOR_ROOT.rgba(), defaults.COLOR_DIA.rgba(), defaults.COLOR_NONDIA.rgba(),
+                tuple(defaults.DASH_PATTERN), defaults.GRID_LINE_WIDTH, defaults.GRID_LINE_WIDTH_ROOT,
+                defaults.GRID_FONT_MAIN_SIZE, defaults.GRID_FONT_SUB_SIZE,
+                self.padding, self.vert_padding, self.right_margin)
+
+    def _update_paint_styles(self):
+        """
+        Builds the pens, brushes and fonts paintGL uses every frame, so the paint loop only selects them
+        instead of constructing and configuring new Qt objects per line and label. They are rebuilt
+        when one of the colours, widths, dash patterns or font sizes they depend on changes.
+        """
+        key = (defaults.COLOR_DETECTED.rgba(), defaults.COLOR_TIME_LINES.rgba(), tuple(defaults.DASH_PATTERN_VERTICAL),
+               defaults.PITCH_LINE_DRAW_COLOR.rgba(), defaults.PITCH_LINE_WIDTH, defaults.GRID_FONT_LABEL_SIZE,
+               defaults.COLOR_PAUSED.rgba(), defaults.VUMETER_FILL_COLOR.rgba())
+        if key == self._paint_style_key:
+            return
+        self._paint_style_key = key
+
+        self._detected_color = QColor(defaults.COLOR_DETECTED)  # Alpha is set per frame from the cents deviation
+        self._pen_detected = QPen(self._detected_color)
+        self._pen_detected.setWidth(1)
+        self._pen_detected.setStyle(Qt.SolidLine)
+        self._pen_time = QPen(defaults.COLOR_TIME_LINES)
+        self._pen_time.setWidth(1)
+        self._pen_time.setStyle(Qt.CustomDashLine)
+        self._pen_time.setDashPattern(defaults.DASH_PATTERN_VERTICAL)
+        self._pen_tick = QPen(QColor(220, 220, 220))
+        self._pen_pitch = QPen(defaults.PITCH_LINE_DRAW_COLOR)
+        self._pen_pitch.setWidth(defaults.PITCH_LINE_WIDTH)  # Make line thicker
+        self._pen_pitch.setCapStyle(Qt.RoundCap)             # Round the line ends
+        self._pen_pitch.setJoinStyle(Qt.RoundJoin)           # Round the line joins
+        self._pen_marker = QPen(defaults.COLOR_PAUSED, 1)
+        self._pen_meter = QPen(QColor(255, 255, 255))
+        self._brush_meter_fill = QBrush(defaults.VUMETER_FILL_COLOR)
+        self._font_tick = QFont()
+        self._font_tick.setPixelSize(8)
+        self._font_label = QFont()
+        self._font_label.setPixelSize(defaults.GRID_FONT_LABEL_SIZE)
+        self._font_meter = QFont()
+        self._font_meter.setPixelSize(10)
+
+    def _render_grid(self, rect, prefer_sharps_local):
+        """
+        Renders the static part of the piano roll (background, scale grid lines and note labels)
+        into a pixmap that paintGL blits every frame.
 
-        painter = QPainter(self)
+        Args:
+            rect (QRect): The widget rectangle.
+            prefer_sharps_local (bool): Whether labels use sharp spellings.
+
+        Returns:
+            QPixmap: The rendered grid layer.
+        """
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(int(rect.width() * dpr), int(rect.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(QColor(30, 30, 30))
+
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
 
-        # Get widget dimensions
-        rect = self.rect()
-        painter.fillRect(rect, QColor(30, 30, 30))
         width = rect.width() - self.right_margin
         height = rect.height()
 
-        # Filter out old points and markers based on MAX_DATA_AGE
-        self.points = [pt for pt in self.points if pt['time'] >= self.latest_time - defaults.MAX_DATA_AGE]
-        self.markers = [mk for mk in self.markers if mk['time'] >= self.latest_time - defaults.MAX_DATA_AGE]
-
         use_scale_highlighting = (defaults.current_scale != "-")
-        prefer_sharps_local = use_sharps_for_key()
-
-        detected_midi = None
-        if self.points and self.points[-1].get('pitch') is not None and self.points[-1]['pitch'] > 0:
-            detected_midi = int(round(69 + 12 * math.log2(self.points[-1]['pitch'] / defaults.TUNING_FREQUENCY)))
-
         min_midi = defaults.MIDI_START
         max_midi = defaults.MIDI_END
         drawn_labels = set()
-        
-        # Get the current scale with proper enharmonic handling
-        current_scale_notes = []
-        is_chromatic = False
-        if use_scale_highlighting and defaults.current_scale != "-":
-            is_chromatic = (defaults.current_scale == "Chromatic")
-            current_scale_notes = defaults.generate_scale()
-            # Get canonical versions for comparison
-            current_scale_canonical = [canonical_note(note) for note in current_scale_notes]
-        
+
+        # Scale membership and spelling come from the precomputed scale cache
+        is_chromatic = (defaults.current_scale == "Chromatic")
+        midi_color_idx = defaults._midi_color_idx
+        scale_spelling = defaults._scale_spelling
+
+        # One pen per grid line style; lines are collected per style and stroked in one drawLines call each
+        root_pen = QPen(defaults.COLOR_ROOT)
+        root_pen.setWidth(defaults.GRID_LINE_WIDTH_ROOT)
+        root_pen.setStyle(Qt.SolidLine)
+        dia_pen = QPen(defaults.COLOR_DIA)
+        dia_pen.setWidth(defaults.GRID_LINE_WIDTH)
+        dia_pen.setStyle(Qt.CustomDashLine)
+        dia_pen.setDashPattern(defaults.DASH_PATTERN)
+        nondia_pen = QPen(defaults.COLOR_NONDIA)
+        nondia_pen.setWidth(defaults.GRID_LINE_WIDTH)
+        nondia_pen.setStyle(Qt.CustomDashLine)
+        nondia_pen.setDashPattern(defaults.DASH_PATTERN)
+        grid_lines = ([], [], [])  # Indexed like _midi_color_idx: non-diatonic, diatonic, root
+        main_font = QFont()
+        main_font.setPixelSize(defaults.GRID_FONT_MAIN_SIZE)
+        sub_font = QFont()
+        sub_font.setPixelSize(defaults.GRID_FONT_SUB_SIZE)
+
         for midi in range(min_midi, max_midi + 1):
             # Use vertical padding for the y-coordinate calculations
             y = self.vert_padding + (max_midi - midi) * (height - 2 * self.vert_padding) / (max_midi - min_midi)
@@ -2199,60 +2981,16 @@ class PianoRollWidget(QOpenGLWidget):
             is_in_scale = False
             is_root_note = False
             if use_scale_highlighting:
-                # Get the note name from MIDI number
-                note_index = midi % 12
-                note_name = SHARP_LETTER_NAMES[note_index] if prefer_sharps_local else FLAT_LETTER_NAMES[note_index]
-                
-                # Get canonical form for comparison
-                canonical_midi_note = canonical_note(note_name)
-                
-                # Check if this is the root note
-                root_canonical = canonical_note(defaults.current_root_note.split("/")[0] if "/" in defaults.current_root_note else defaults.current_root_note)
-                is_root_note = (canonical_midi_note == root_canonical)
-                
-                # Check if this note is in the scale
-                is_in_scale = canonical_midi_note in current_scale_canonical
-                
-                # Style the grid line based on whether it's in the scale
-                if is_root_note:
-                    pen = QPen(defaults.COLOR_ROOT)
-                    pen.setWidth(defaults.GRID_LINE_WIDTH_ROOT)
-                    pen.setStyle(Qt.SolidLine)
-                elif is_in_scale:
-                    pen = QPen(defaults.COLOR_DIA)
-                    pen.setWidth(defaults.GRID_LINE_WIDTH)
-                    pen.setStyle(Qt.CustomDashLine)
-                    pen.setDashPattern(defaults.DASH_PATTERN)
-                else:
-                    pen = QPen(defaults.COLOR_NONDIA)
-                    pen.setWidth(defaults.GRID_LINE_WIDTH)
-                    pen.setStyle(Qt.CustomDashLine)
-                    pen.setDashPattern(defaults.DASH_PATTERN)
+                # 2 = root note, 1 = in scale, 0 = outside the scale
+                color_idx = midi_color_idx[midi]
+                is_root_note = (color_idx == 2)
+                is_in_scale = (color_idx != 0)
             else:
                 # Default styling when no scale is selected
-                #if midi % 12 == 0:
-                #    pen = QPen(defaults.COLOR_ROOT)
-                #    pen.setWidth(defaults.GRID_LINE_WIDTH_ROOT)
-                #    pen.setStyle(Qt.SolidLine)
-                #else:
-                    pen = QPen(defaults.COLOR_NONDIA)
-                    pen.setWidth(defaults.GRID_LINE_WIDTH)
-                    pen.setStyle(Qt.CustomDashLine)
-                    pen.setDashPattern(defaults.DASH_PATTERN)
-
-            painter.setPen(pen)
-            painter.drawLine(int(self.padding), int(y), int(width), int(y))
+                color_idx = 0
 
-            if (detected_midi is not None and midi == detected_midi) and defaults.DRAW_DETECTED_LINE == True:
-                # Calculate alpha based on cents deviation (0-255)
-                alpha = max(0, min(255, 255 - (abs(self.cents) * 4)))
-                detected_color = QColor(defaults.COLOR_DETECTED)
-                detected_color.setAlpha(alpha)
-                pen = QPen(detected_color)
-                pen.setWidth(1)
-                pen.setStyle(Qt.SolidLine)
-                painter.setPen(pen)
-                painter.drawLine(int(self.padding), int(y), int(width), int(y))
+            # Style the grid line based on whether it's in the scale
+            grid_lines[color_idx].append(QLine(int(self.padding), int(y), int(width), int(y)))
 
             # Draw labels for scale notes
             draw_label = (use_scale_highlighting and is_in_scale) or (not use_scale_highlighting)
@@ -2262,9 +3000,6 @@ class PianoRollWidget(QOpenGLWidget):
                 
                 # If using scale highlighting, try to find the actual scale note (with correct enharmonic)
                 if use_scale_highlighting and is_in_scale:
-                    # Get the canonical form of this MIDI note
-                    midi_note_canonical = canonical_note(SHARP_LETTER_NAMES[note_index])
-                    
                     # For chromatic scale, use consistent accidentals based on user preference 
                     if is_chromatic:
                         if prefer_sharps_local:
@@ -2274,13 +3009,9 @@ class PianoRollWidget(QOpenGLWidget):
                             letter = FLAT_LETTER_NAMES[note_index]
                             solfege = FLAT_SOLFEGE_NAMES[note_index]
                     else:
-                        # For non-chromatic scales, find the matching note in the scale
-                        matching_note = None
-                        for i, scale_canonical in enumerate(current_scale_canonical):
-                            if scale_canonical == midi_note_canonical:
-                                matching_note = current_scale_notes[i]
-                                break
-                        
+                        # For non-chromatic scales, use the scale's spelling of this pitch class
+                        matching_note = scale_spelling[note_index]
+
                         # Use the matching note from the scale if found
                         if matching_note:
                             letter = matching_note
@@ -2305,10 +3036,6 @@ class PianoRollWidget(QOpenGLWidget):
                 canon_letter = canonical_note(letter)
                 label_pair = (canon_letter, octave_val)
                 if label_pair not in drawn_labels:
-                    main_font = QFont()
-                    main_font.setPixelSize(defaults.GRID_FONT_MAIN_SIZE)
-                    sub_font = QFont()
-                    sub_font.setPixelSize(defaults.GRID_FONT_SUB_SIZE)
                     #text_color = defaults.COLOR_ROOT if (is_root_note or midi % 12 == 0) else defaults.COLOR_DIA
                     text_color = defaults.COLOR_ROOT if (is_root_note) else defaults.COLOR_DIA
                     painter.setPen(QPen(text_color))
@@ -2325,6 +3052,72 @@ class PianoRollWidget(QOpenGLWidget):
                         painter.drawText(int(width) + horizontalAdvance + 10, int(y) + 7, str(octave_val))
                     drawn_labels.add(label_pair)
 
+        for pen, lines in zip((nondia_pen, dia_pen, root_pen), grid_lines):
+            if lines:
+                painter.setPen(pen)
+                painter.drawLines(lines)
+
+        painter.end()
+        return pixmap
+
+    def paintGL(self):
+        """
+        OpenGL-accelerated painting of the piano roll.
+        This replaces the old paintEvent method.
+        """
+        self._dirty = False
+        self._vu_dirty = False
+        self._since_paint.restart()
+        current_time = time.time()
+        self.pr_update_count += 1
+        if current_time - self.pr_last_time >= 1.0:
+            self.pr_fps = self.pr_update_count / (current_time - self.pr_last_time)
+            self.pr_update_count = 0
+            self.pr_last_time = current_time
+
+        self._update_paint_styles()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+
+        # Get widget dimensions
+        rect = self.rect()
+        width = rect.width() - self.right_margin
+        height = rect.height()
+
+        # Filter out old points and markers based on MAX_DATA_AGE (their times are non-decreasing,
+        # so expiring only moves the start of the point span and pops markers from the left)
+        oldest_time = self.latest_time - defaults.MAX_DATA_AGE
+        self._points_start += int(np.searchsorted(self._point_time[self._points_start:self._points_end], oldest_time))
+        points_start, points_end = self._points_start, self._points_end
+        markers = self.markers
+        while markers and markers[0]['time'] < oldest_time:
+            markers.popleft()
+
+        prefer_sharps_local = defaults._prefer_sharps_for_key
+
+        # Blit the static grid layer, re-rendering it only when one of its inputs changed
+        grid_key = self._get_grid_cache_key(rect, prefer_sharps_local)
+        if self._grid_cache is None or grid_key != self._grid_cache_key:
+            self._grid_cache = self._render_grid(rect, prefer_sharps_local)
+            self._grid_cache_key = grid_key
+        painter.drawPixmap(0, 0, self._grid_cache)
+
+        min_midi = defaults.MIDI_START
+        max_midi = defaults.MIDI_END
+
+        # Highlight the grid line of the currently detected note
+        if defaults.DRAW_DETECTED_LINE == True and points_end > points_start and self._point_pitch[points_end - 1] > 0:
+            detected_midi = int(round(69 + 12 * math.log2(self._point_pitch[points_end - 1] / defaults.TUNING_FREQUENCY)))
+            if min_midi <= detected_midi <= max_midi:
+                y = self.vert_padding + (max_midi - detected_midi) * (height - 2 * self.vert_padding) / (max_midi - min_midi)
+                # Calculate alpha based on cents deviation (0-255)
+                alpha = max(0, min(255, 255 - (abs(self.cents) * 4)))
+                self._detected_color.setAlpha(alpha)
+                self._pen_detected.setColor(self._detected_color)
+                painter.setPen(self._pen_detected)
+                painter.drawLine(int(self.padding), int(y), int(width), int(y))
+
         # Draw time ticks for each second (using adjusted time) and dump ticks older than MAX_DATA_AGE
         visible_duration = width / self.scroll_speed
         display_time = self.latest_time  # Already adjusted for paused time
@@ -2333,113 +3126,106 @@ class PianoRollWidget(QOpenGLWidget):
         max_age_time = self.latest_time - defaults.MAX_DATA_AGE
         if start_time < max_age_time:
             start_time = max_age_time
-        t = math.ceil(start_time)
-        while t <= display_time:
-            x = width - (display_time - t) * self.scroll_speed
-            if t >= 0:
-                pen = QPen(defaults.COLOR_TIME_LINES)
-                pen.setWidth(1)
-                pen.setStyle(Qt.CustomDashLine)
-                pen.setDashPattern(defaults.DASH_PATTERN_VERTICAL)
-                painter.setPen(pen)
-
-                painter.drawLine(int(x), int(height - self.vert_padding), int(x), int(self.vert_padding))
-
-                painter.setPen(QPen(QColor(220, 220, 220)))
-                painter.drawLine(int(x), int(height - self.vert_padding), int(x), int(height - self.vert_padding + 5))
-                font = QFont()
-                font.setPixelSize(8)
-                painter.setFont(font)
-                painter.drawText(int(x) - 10, int(height - self.vert_padding + 15), str(t))
-            t += 1
+        # Grid lines and tick marks are batched into one drawLines call per pen
+        tick_times = range(max(math.ceil(start_time), 0), math.floor(display_time) + 1)
+        if tick_times:
+            tick_xs = [int(width - (display_time - t) * self.scroll_speed) for t in tick_times]
+            bottom = int(height - self.vert_padding)
+            painter.setPen(self._pen_time)
+            painter.drawLines([QLine(x, bottom, x, int(self.vert_padding)) for x in tick_xs])
+            painter.setPen(self._pen_tick)
+            painter.drawLines([QLine(x, bottom, x, int(height - self.vert_padding + 5)) for x in tick_xs])
+            painter.setFont(self._font_tick)
+            label_y = int(height - self.vert_padding + 15)
+            draw_text = painter.drawText
+            for x, t in zip(tick_xs, tick_times):
+                draw_text(x - 10, label_y, str(t))
 
         # ------------------- Draw pitch line (optimized) -------------------
-        if len(self.points) > 1:
+        last_drawn = (-1, 0.0, 0.0)  # (point index, x, y) of the newest point placed on the pitch line
+        if points_end - points_start > 1:
             # Only process points that are visible (i.e. within the drawn time window)
             visible_start_time = display_time - (width / self.scroll_speed)
-            visible_points = [pt for pt in self.points if pt['time'] >= visible_start_time]
-
-            # Optional: Downsample if there are many points
-            #max_points = 1000
-            #if len(visible_points) > max_points:
-            #    step = len(visible_points) // max_points
-            #    visible_points = visible_points[::step]
-
-            pen = QPen(defaults.PITCH_LINE_DRAW_COLOR)
-            pen.setWidth(defaults.PITCH_LINE_WIDTH)  # Make line thicker
-            pen.setCapStyle(Qt.RoundCap)             # Round the line ends
-            pen.setJoinStyle(Qt.RoundJoin)           # Round the line joins
+            first_visible = points_start + int(np.searchsorted(self._point_time[points_start:points_end], visible_start_time))
+            pitches = self._point_pitch[first_visible:points_end]
+
+            pen = self._pen_pitch
+            pen.setColor(defaults.PITCH_LINE_DRAW_COLOR)  # Undo the previous frame's alpha adjustment
             painter.setPen(pen)
-            path = QPainterPath()
-            first_point = True
-
-            for point in visible_points:
-                # Check for breaks indicated by pitch <= 0 or a missing pitch
-                if point.get('pitch') is None or point.get('pitch') <= 0:
-                    # When a break occurs, draw the current segment if any
-                    if not first_point:
-                        painter.drawPath(path)
-                        path = QPainterPath()
-                        first_point = True
-                    continue
 
-                # Convert pitch to the corresponding MIDI value and compute (x, y)
-                midi_val = 69 + 12 * math.log2(point['pitch'] / defaults.TUNING_FREQUENCY)
-                midi_val = max(defaults.MIDI_START, min(defaults.MIDI_END, midi_val))
+            # Breaks are indicated by pitch <= 0 or a missing (NaN) pitch; every run of valid points
+            # between breaks becomes one path. Coordinates are computed for all points at once.
+            valid = np.flatnonzero(pitches > 0)
+            if len(valid) > 1:
+                midi_vals = 69 + 12 * np.log2(pitches[valid] / defaults.TUNING_FREQUENCY)
+                np.clip(midi_vals, defaults.MIDI_START, defaults.MIDI_END, out=midi_vals)
                 # Use vertical padding for y calculation
-                y = self.vert_padding + (defaults.MIDI_END - midi_val) * (height - 2 * self.vert_padding) / (defaults.MIDI_END - defaults.MIDI_START)
-                x = width - (display_time - point['time']) * self.scroll_speed
-
-                # If alpha adjustment is enabled, update pen color before adding the point
+                ys = (self.vert_padding + (defaults.MIDI_END - midi_vals) * (height - 2 * self.vert_padding) / (defaults.MIDI_END - defaults.MIDI_START)).tolist()
+                xs = (width - (display_time - self._point_time[first_visible:points_end][valid]) * self.scroll_speed).tolist()
+                run_splits = (np.flatnonzero(np.diff(valid) > 1) + 1).tolist()
+                last_drawn = (first_visible + int(valid[-1]), xs[-1], ys[-1])
                 if defaults.PITCH_LINE_ALPHA_ADJUSTMENT:
-                    cents = point.get('cents', 0)
-                    alpha = max(0, min(255, 255 - (abs(cents) * 5)))
-                    line_color = QColor(defaults.PITCH_LINE_DRAW_COLOR)
-                    line_color.setAlpha(alpha)
-                    pen.setColor(line_color)
-                    painter.setPen(pen)
-
-                # Accumulate a continuous path between valid points
-                if first_point:
-                    path.moveTo(x, y)
-                    first_point = False
-                else:
-                    path.lineTo(x, y)
+                    cents = self._point_cents[first_visible:points_end][valid].tolist()
 
-            # Draw any remaining path segment
-            if not first_point and path.elementCount() > 0:
-                painter.drawPath(path)
+                for run_start, run_end in zip([0] + run_splits, run_splits + [len(valid)]):
+                    # A single point has no segment to stroke
+                    if run_end - run_start < 2:
+                        continue
+                    # With alpha adjustment a run is drawn with the alpha of its last point
+                    if defaults.PITCH_LINE_ALPHA_ADJUSTMENT:
+                        alpha = max(0, min(255, 255 - (abs(cents[run_end - 1]) * 5)))
+                        line_color = QColor(defaults.PITCH_LINE_DRAW_COLOR)
+                        line_color.setAlpha(alpha)
+                        pen.setColor(line_color)
+                        painter.setPen(pen)
+
+                    path = QPainterPath()
+                    path.moveTo(xs[run_start], ys[run_start])
+                    line_to = path.lineTo
+                    for i in range(run_start + 1, run_end):
+                        line_to(xs[i], ys[i])
+                    painter.drawPath(path)
         # ------------------- End pitch line drawing -------------------
 
         # Draw the last pitch label if available using the latest_time for x coordinate.
         if defaults.PITCH_LABEL_ENABLED:
-            if self.points:
-                last_point = self.points[-1]
-                if last_point.get('pitch') is None:
-                    if len(self.points) > 1:
-                        last_point = self.points[-2]
-                if last_point.get('pitch') is not None:
-                    midi_val = 69 + 12 * math.log2(last_point['pitch'] / defaults.TUNING_FREQUENCY)
+            if points_end > points_start:
+                last = points_end - 1
+                if math.isnan(self._point_pitch[last]):
+                    if points_end - points_start > 1:
+                        last -= 1
+                if last == last_drawn[0]:
+                    # The label sits on the pitch line's newest point, whose position is already known
+                    _, x, y = last_drawn
+                elif not math.isnan(self._point_pitch[last]):
+                    midi_val = 69 + 12 * math.log2(self._point_pitch[last] / defaults.TUNING_FREQUENCY)
                     midi_val = max(defaults.MIDI_START, min(defaults.MIDI_END, midi_val))
                     y = self.vert_padding + (defaults.MIDI_END - midi_val) * (height - 2 * self.vert_padding) / (defaults.MIDI_END - defaults.MIDI_START)
-                    x = width - (display_time - last_point['time']) * self.scroll_speed
+                    x = width - (display_time - self._point_time[last]) * self.scroll_speed
+                else:
+                    last = -1
+                if last >= 0:
                     painter.setPen(defaults.PITCH_LABEL_COLOR)
-                    font = QFont()
-                    font.setPixelSize(defaults.GRID_FONT_LABEL_SIZE)
-                    painter.setFont(font)
-                    _ = drawAdjustedText(painter, int(x) + 5, int(y) - 5, last_point.get('label', ""), flat_char="♭", adjustment=-3)
+                    painter.setFont(self._font_label)
+                    _ = drawAdjustedText(painter, int(x) + 5, int(y) - 5, self._point_label[last] or "", flat_char="♭", adjustment=-3)
 
         # Draw pause/resume markers with filtering to avoid duplicates or very close markers.
         last_marker_x = None
         marker_threshold = 5  # Minimum pixel distance between markers
+        scroll_speed = self.scroll_speed
+        marker_top = int(self.vert_padding)
+        marker_bottom = int(height - self.vert_padding)
+        marker_lines = []
+        add_marker_line = marker_lines.append
         for marker in self.markers:
-            x = width - (display_time - marker['time']) * self.scroll_speed
+            x = width - (display_time - marker['time']) * scroll_speed
             if last_marker_x is not None and abs(x - last_marker_x) < marker_threshold:
                 continue
-            pen = QPen(defaults.COLOR_PAUSED, 1)
-            painter.setPen(pen)
-            painter.drawLine(int(x), int(self.vert_padding), int(x), int(height - self.vert_padding))
+            add_marker_line(QLine(int(x), marker_top, int(x), marker_bottom))
             last_marker_x = x
+        if marker_lines:
+            painter.setPen(self._pen_marker)
+            painter.drawLines(marker_lines)
 
         meter_width = 100
         meter_height = 10
@@ -2448,21 +3234,19 @@ class PianoRollWidget(QOpenGLWidget):
         meter_post_y = margin + 20
         meter_pre_y = meter_post_y - meter_height - gap
 
-        painter.setPen(QPen(QColor(255, 255, 255)))
+        painter.setPen(self._pen_meter)
         painter.drawRect(margin, meter_pre_y, meter_width, meter_height)
         fill_fraction_pre = min(self.vu_level_pre / 0.1, 1.0)
         fill_width_pre = int((meter_width-1) * fill_fraction_pre)
-        painter.fillRect(margin + 1, meter_pre_y + 1, fill_width_pre, meter_height - 1, defaults.VUMETER_FILL_COLOR)
-        font = QFont()
-        font.setPixelSize(10)
-        painter.setFont(font)
+        painter.fillRect(margin + 1, meter_pre_y + 1, fill_width_pre, meter_height - 1, self._brush_meter_fill)
+        painter.setFont(self._font_meter)
         painter.drawText(margin + meter_width + 5, meter_pre_y + meter_height - 1, "Pre-Gain")
 
-        painter.setPen(QPen(QColor(255, 255, 255)))
+        painter.setPen(self._pen_meter)
         painter.drawRect(margin, meter_post_y, meter_width, meter_height)
         fill_fraction_post = min(self.vu_level_post / 0.1, 1.0)
         fill_width_post = int((meter_width-1) * fill_fraction_post)
-        painter.fillRect(margin + 1, meter_post_y + 1, fill_width_post, meter_height - 1, defaults.VUMETER_FILL_COLOR)
+        painter.fillRect(margin + 1, meter_post_y + 1, fill_width_post, meter_height - 1, self._brush_meter_fill)
         painter.drawText(margin + meter_width + 5, meter_post_y + meter_height - 1, "Post-Gain")
 
         painter.end()
@@ -2520,6 +3304,77 @@ class PianoRollWidget(QOpenGLWidget):
         return self.pr_fps
 
 
+# Staff step above C and accidental for each semitone above C, spelled with sharps or with flats
+_STAFF_STEPS_SHARP = (0, 0, 1, 1, 2, 3, 3, 4, 4, 5, 5, 6)
+_STAFF_STEPS_FLAT = (0, 1, 1, 2, 2, 3, 4, 4, 5, 5, 6, 6)
+_STAFF_ACCIDENTALS_SHARP = ("", "#", "", "#", "", "", "#", "", "#", "", "#", "")
+_STAFF_ACCIDENTALS_FLAT = ("", "♭", "", "♭", "", "", "♭", "", "♭", "", "♭", "")
+
+# Quarter note head: a 12x8 ellipse centered at the origin, rotated 15 degrees to the left
+_NOTE_HEAD_PATH = QPainterPath()
+_NOTE_HEAD_PATH.addEllipse(-6, -4, 12, 8)
+_NOTE_HEAD_PATH = QTransform().rotate(-15).map(_NOTE_HEAD_PATH)
+
+
+@functools.lru_cache(maxsize=512)
+def staff_note_layout(midi, prefer_sharps, staff_top, staff_height):
+    """
+    Computes where a note is drawn on the treble/bass staff pair of the pitch panel.
+    Results are memoized, since only a few dozen notes are ever shown for a given staff geometry.
+    
+    Args:
+        midi (int): MIDI note number of the detected note (notes below 60 use the bass staff).
+        prefer_sharps (bool): Whether black keys are spelled with sharps rather than flats.
+        staff_top (float): Y coordinate of the top line of the treble staff.
+        staff_height (float): Height of each staff, from its top to its bottom line.
+        
+    Returns:
+        tuple: (y_note, stem_up, accidental, ledger_ys) - the note head centre, whether the stem
+               points upward, the accidental to draw and the Y coordinates of any ledger lines.
+    """
+    ledger_y = int(staff_top + staff_height + (staff_height / 4))
+    spacing = staff_height / 8
+    f_staff_top = ledger_y + 8 * spacing - 0.75 * staff_height
+    if midi >= 60:
+        semitone_count = (midi - 60) % 12
+        octave_count = (midi - 60) // 12
+    else:
+        semitone_count = 11 - (abs(midi - 59) % 12)
+        octave_count = abs(midi - 59) // 12 + 1
+
+    # Staff position (in diatonic steps above C) and accidental of the pitch class
+    if prefer_sharps:
+        staff_spaces = _STAFF_STEPS_SHARP[semitone_count]
+        accidental = _STAFF_ACCIDENTALS_SHARP[semitone_count]
+    else:
+        staff_spaces = _STAFF_STEPS_FLAT[semitone_count]
+        accidental = _STAFF_ACCIDENTALS_FLAT[semitone_count]
+
+    # Both staves count steps from the middle C ledger line between them
+    middle_c_y = staff_top + staff_height + staff_height / 4
+    if midi >= 60:
+        staff_spaces += octave_count * 7
+    else:
+        staff_spaces = ((octave_count * 7) * -1) + staff_spaces
+        staff_top = f_staff_top
+    y_note = middle_c_y - staff_spaces * spacing
+
+    # Ledger lines above or below whichever staff the note sits on
+    line_gap = staff_height / 4
+    if y_note < staff_top:
+        num_ledgers = int((staff_top - y_note) / line_gap)
+        ledger_ys = tuple(int(staff_top - (i + 1) * line_gap) for i in range(num_ledgers))
+    elif y_note > staff_top + staff_height:
+        num_ledgers = int((y_note - (staff_top + staff_height)) / line_gap)
+        ledger_ys = tuple(int(staff_top + staff_height + (i + 1) * line_gap) for i in range(num_ledgers))
+    else:
+        ledger_ys = ()
+
+    # The stem points away from the staff centre
+    stem_up = y_note > staff_top + staff_height / 2
+    return y_note, stem_up, accidental, ledger_ys
+
+
 # --------------------------- Pitch Information Panel (Staff Display) ---------------------------
 class PitchInfoPanel(QWidget):
     """
@@ -2533,6 +3388,7 @@ class PitchInfoPanel(QWidget):
         self.setFixedWidth(140)
         self.full_note = ""
         self.frequency = 0.0
+        self.midi = -1  # MIDI note drawn on the staff, set by update_pitch (-1 = none)
         self.cents = 0
         self.initUI()
 
@@ -2563,6 +3419,20 @@ class PitchInfoPanel(QWidget):
         self.cents_label.setFont(cents_font)
         
         self.note_label.setTextFormat(Qt.RichText)
+        self._note_label_style = None
+
+        # Static staff lines, rebuilt by paintEvent only when the widget width or staff geometry changes
+        self._staff_lines_key = None
+        self._staff_lines = []
+
+        # Staff pens and brushes (see _update_staff_styles) and the fixed-size staff fonts
+        self._staff_style_key = None
+        self._font_treble = QFont()
+        self._font_treble.setPixelSize(38)
+        self._font_bass = QFont()
+        self._font_bass.setPixelSize(30)
+        self._font_accidental = QFont()
+        self._font_accidental.setPixelSize(16)
 
         # Create value labels with small font
         value_font = QFont()
@@ -2701,6 +3571,7 @@ class PitchInfoPanel(QWidget):
             self.cents_label.setText("--")
             self.staff_note = None
             self.frequency = 0.0  # Add this line to update the frequency
+            self.midi = -1
             self.update()
             return
             
@@ -2728,7 +3599,7 @@ class PitchInfoPanel(QWidget):
             self.cents_label.setText(f"{cents}")
         
         # Set default text color
-        note_color = QColor(255, 255, 255)  # Default white
+        note_color = (255, 255, 255)  # Default white
         scale_match = False
         
         # Default to showing the original note name
@@ -2737,65 +3608,48 @@ class PitchInfoPanel(QWidget):
         # Get the MIDI value of the detected note for comparison
         detected_midi = int(round(69 + 12 * math.log2(frequency / defaults.TUNING_FREQUENCY)))
         detected_note_index = detected_midi % 12
+        self.midi = detected_midi
             
         # Get the current scale for highlighting
         if hasattr(defaults, 'generate_scale') and defaults.current_scale != "-":
             # Check if this is a chromatic scale
             is_chromatic = (defaults.current_scale == "Chromatic")
             
-            # Get the current scale with proper enharmonic handling
-            current_scale = defaults.generate_scale()
-            
-            # Get canonical versions for comparison
-            canonical_detected = canonical_note(letter_part)
-            canonical_scale = [canonical_note(n) for n in current_scale]
-            
+            # Pitch class of the displayed letter (None for solfege-only labels)
+            detected_pc = NAME_TO_PC.get(canonical_note(letter_part))
+
             # Calculate how close the detected note is to a scale note
-            if canonical_detected in canonical_scale:
+            if detected_pc is not None and (defaults._scale_mask >> detected_pc) & 1:
                 # The note is exactly in the scale, use the PITCH_LINE_DRAW_COLOR
-                note_color = QColor(defaults.PITCH_LINE_DRAW_COLOR)
+                note_color = defaults.PITCH_LINE_DRAW_COLOR.getRgb()[:3]
                 scale_match = True
             else:
                 # Check if we're close to a scale note (based on cents deviation)
-                # Get the exact frequency of the detected note without cents deviation
-                exact_detected_freq = defaults.TUNING_FREQUENCY * (2 ** ((detected_midi - 69) / 12))
-                
-                # Find the closest scale note
+                # Find the closest scale note. Every scale note is compared at or below the detected
+                # note, so the closest is the scale pitch class fewest semitones below (precomputed).
                 closest_distance = float('inf')
-                closest_midi = None
                 closest_scale_note = None
-                closest_index = None
-                
-                for i, scale_note in enumerate(current_scale):
-                    scale_midi = None
-                    # Convert each scale note to MIDI
-                    for j, sharp_note in enumerate(SHARP_LETTER_NAMES):
-                        if canonical_note(scale_note) == canonical_note(sharp_note):
-                            scale_midi = detected_midi - (detected_note_index - j) % 12
-                            break
-                    
-                    if scale_midi is not None:
-                        # Calculate distance to this scale note
-                        scale_freq = defaults.TUNING_FREQUENCY * (2 ** ((scale_midi - 69) / 12))
-                        cents_diff = abs(1200 * math.log2(frequency / scale_freq))
-                        
-                        if cents_diff < closest_distance:
-                            closest_distance = cents_diff
-                            closest_midi = scale_midi
-                            closest_scale_note = scale_note
-                            closest_index = i
+                closest_pc = defaults._scale_pc_at_or_below[detected_note_index]
+                if closest_pc is not None:
+                    closest_midi = detected_midi - (detected_note_index - closest_pc) % 12
+                    if 0 <= closest_midi < 128:
+                        scale_freq = et_frequencies(defaults.TUNING_FREQUENCY)[closest_midi]
+                    else:
+                        scale_freq = defaults.TUNING_FREQUENCY * (2 ** ((closest_midi - 69) / 12))
+                    closest_distance = abs(1200 * math.log2(frequency / scale_freq))
+                    closest_scale_note = defaults._scale_spelling[closest_pc]
                 
                 # Color based on proximity to closest scale note
                 if closest_distance <= 50:  # Within 50 cents of a scale note
                     # Interpolate color: white -> PITCH_LINE_DRAW_COLOR based on proximity
                     proximity = 1.0 - (closest_distance / 50.0)  # 1.0 = exact match, 0.0 = 50 cents away
-                    target_color = QColor(defaults.PITCH_LINE_DRAW_COLOR)
+                    target_r, target_g, target_b = defaults.PITCH_LINE_DRAW_COLOR.getRgb()[:3]
                     
-                    r = int(255 + proximity * (target_color.red() - 255))
-                    g = int(255 + proximity * (target_color.green() - 255))
-                    b = int(255 + proximity * (target_color.blue() - 255))
+                    r = int(255 + proximity * (target_r - 255))
+                    g = int(255 + proximity * (target_g - 255))
+                    b = int(255 + proximity * (target_b - 255))
                     
-                    note_color = QColor(r, g, b)
+                    note_color = (r, g, b)
                     
                     # Show the closest scale note if we're very close (within 25 cents)
                     if closest_distance <= 25 and closest_scale_note is not None:
@@ -2806,7 +3660,7 @@ class PitchInfoPanel(QWidget):
             # Update note display based on whether it's in the scale
             if scale_match:
                 if is_chromatic:
-                    prefer_sharps = use_sharps_for_key()
+                    prefer_sharps = defaults._prefer_sharps_for_key
                     
                     if defaults.PITCH_LABEL_SOLFEGE:
                         if prefer_sharps:
@@ -2844,11 +3698,7 @@ class PitchInfoPanel(QWidget):
                 else:
                     # Non-chromatic scale - find the matching scale note
                     if 'matching_scale_note' not in locals():
-                        matching_scale_note = None
-                        for i, scale_canon in enumerate(canonical_scale):
-                            if scale_canon == canonical_detected:
-                                matching_scale_note = current_scale[i]
-                                break
+                        matching_scale_note = defaults._scale_spelling[detected_pc]
                     
                     # Update note display with correct notation from the scale
                     if defaults.PITCH_LABEL_SOLFEGE and matching_scale_note:
@@ -2884,7 +3734,7 @@ class PitchInfoPanel(QWidget):
                 # Option 2: Always show notes with proper diatonic spelling
                 if not is_chromatic and defaults.current_scale != "-":
                     # Find the appropriate enharmonic spelling based on the key signature
-                    prefer_sharps = use_sharps_for_key()
+                    prefer_sharps = defaults._prefer_sharps_for_key
                     
                     if prefer_sharps:
                         diatonic_letter = SHARP_LETTER_NAMES[detected_note_index]
@@ -2916,8 +3766,12 @@ class PitchInfoPanel(QWidget):
             # No scale selected, just use default display
              self.note_label.setText(format_note_with_html(updated_note))
         
-        # Apply the calculated color to the note label
-        self.note_label.setStyleSheet(f"color: rgb({note_color.red()}, {note_color.green()}, {note_color.blue()}); font-size: {defaults.FONT_SIZE_NOTE_LABEL}px; font-weight: bold;")
+        # Apply the calculated color to the note label. Setting a style sheet makes Qt reparse it
+        # and repolish the label, so only do so when the resulting style actually changes.
+        note_style = f"color: rgb{note_color}; font-size: {defaults.FONT_SIZE_NOTE_LABEL}px; font-weight: bold;"
+        if note_style != self._note_label_style:
+            self._note_label_style = note_style
+            self.note_label.setStyleSheet(note_style)
         
         # Update frequency display
         self.freq_label.setText(f"{frequency:.1f} Hz")
@@ -2930,163 +3784,78 @@ class PitchInfoPanel(QWidget):
         self.stats.setHtml(message)
         #self.stats.moveCursor(QTextCursor.End)
 
+    def _update_staff_styles(self):
+        """
+        Builds the pens and brushes paintEvent uses for the staff, clefs and note, so a repaint only
+        selects them. They are rebuilt when one of the staff colours changes.
+        """
+        key = (defaults.STAFF_MAIN_COLOR.rgba(), defaults.STAFF_CLEF_COLOR.rgba(), defaults.STAFF_NOTE_COLOR.rgba())
+        if key == self._staff_style_key:
+            return
+        self._staff_style_key = key
+
+        self._pen_staff = QPen(defaults.STAFF_MAIN_COLOR, 1)
+        self._pen_clef = QPen(defaults.STAFF_CLEF_COLOR)
+        self._pen_note = QPen(defaults.STAFF_NOTE_COLOR)
+        self._pen_stem = QPen(defaults.STAFF_NOTE_COLOR, 2)
+        self._brush_staff = QBrush(defaults.STAFF_MAIN_COLOR)
+        self._brush_note = QBrush(defaults.STAFF_NOTE_COLOR)
+
     def paintEvent(self, event):
         """
         Custom paint event to draw the musical staff and note on the panel.
         """
         super(PitchInfoPanel, self).paintEvent(event)
+        self._update_staff_styles()
         upper_staff_top = defaults.DEFAULT_STAFF_TOP_OFFSET
         upper_staff_height = defaults.DEFAULT_STAFF_HEIGHT
 
         painter = QPainter(self)
-        rect = self.rect()
-        painter.setPen(QPen(defaults.STAFF_MAIN_COLOR))
-        for i in range(5):
-            y_line = int(upper_staff_top + i * (upper_staff_height / 4))
-            painter.setPen(QPen(defaults.STAFF_MAIN_COLOR, 1))
-            painter.drawLine(10, y_line, self.width() - 10, y_line)
-
         staff_middle_width = self.width() / 2 + 7
         ledger_y = int(upper_staff_top + upper_staff_height + (upper_staff_height / 4))
         f_staff_height = defaults.DEFAULT_STAFF_HEIGHT
         spacing_bass = f_staff_height / 8
         f_staff_top = ledger_y + 8 * spacing_bass - 0.75 * f_staff_height
-        for i in range(5):
-            y_line = int(f_staff_top + i * (f_staff_height / 4))
-            painter.setPen(QPen(defaults.STAFF_MAIN_COLOR, 1))
-            painter.drawLine(10, y_line, self.width() - 10, y_line)
-
-        painter.setPen(QPen(defaults.STAFF_CLEF_COLOR))
-        treble_font = QFont()
-        treble_font.setPixelSize(38)
-        painter.setFont(treble_font)
+
+        # Draw the five treble and five bass staff lines in a single call
+        staff_lines_key = (self.width(), upper_staff_top, upper_staff_height, f_staff_height)
+        if staff_lines_key != self._staff_lines_key:
+            self._staff_lines_key = staff_lines_key
+            right = self.width() - 10
+            self._staff_lines = [QLine(10, int(top + i * (height / 4)), right, int(top + i * (height / 4)))
+                                 for top, height in ((upper_staff_top, upper_staff_height), (f_staff_top, f_staff_height))
+                                 for i in range(5)]
+        painter.setPen(self._pen_staff)
+        painter.drawLines(self._staff_lines)
+
+        painter.setPen(self._pen_clef)
+        painter.setFont(self._font_treble)
         painter.drawText(15, int(upper_staff_top + (upper_staff_height / 4 * 3) + 8), "𝄞")
         
-        bass_font = QFont()
-        bass_font.setPixelSize(30)
-        painter.setFont(bass_font)
+        painter.setFont(self._font_bass)
         painter.drawText(17, int(f_staff_top + (f_staff_height / 4) + 14), "𝄢")
 
-        try:
-            _, _, midi, _ = frequency_to_note(self.frequency, defaults.global_prefer_sharps)
-        except Exception:
-            midi = 85
-
+        # The note was already resolved by update_pitch
+        midi = self.midi
         if midi > 0:
-            spacing_treble = upper_staff_height / 8
-            spacing_bass = f_staff_height / 8
-            staff_accidental = ""
-            if midi >= 60:
-                semitone_count = (midi - 60) % 12
-                octave_count = (midi - 60) // 12
-            else:
-                semitone_count = 11 - (abs(midi - 59) % 12)
-                octave_count = abs(midi - 59) // 12 + 1
-
-            if semitone_count == 0:
-                staff_spaces = 0
-            if semitone_count == 1:
-                if defaults.global_prefer_sharps:
-                    staff_spaces = 0
-                    staff_accidental = "#"
-                else:
-                    staff_spaces = 1
-                    staff_accidental = "♭"
-            if semitone_count == 2:
-                staff_spaces = 1
-            if semitone_count == 3:
-                if defaults.global_prefer_sharps:
-                    staff_spaces = 1
-                    staff_accidental = "#"
-                else:
-                    staff_spaces = 2
-                    staff_accidental = "♭"
-            if semitone_count == 4:
-                staff_spaces = 2
-            if semitone_count == 5:
-                staff_spaces = 3
-            if semitone_count == 6:
-                if defaults.global_prefer_sharps:
-                    staff_spaces = 3
-                    staff_accidental = "#"
-                else:
-                    staff_spaces = 4
-                    staff_accidental = "♭"
-            if semitone_count == 7:
-                staff_spaces = 4
-            if semitone_count == 8:
-                if defaults.global_prefer_sharps:
-                    staff_spaces = 4
-                    staff_accidental = "#"
-                else:
-                    staff_spaces = 5
-                    staff_accidental = "♭"
-            if semitone_count == 9:
-                staff_spaces = 5
-            if semitone_count == 10:
-                if defaults.global_prefer_sharps:
-                    staff_spaces = 5
-                    staff_accidental = "#"
-                else:
-                    staff_spaces = 6
-                    staff_accidental = "♭"
-            if semitone_count == 11:
-                staff_spaces = 6
-
-            if midi >= 60:
-                staff_spaces += octave_count * 7
-                y_note = (upper_staff_top + upper_staff_height + upper_staff_height / 4) - staff_spaces * spacing_treble
-            else:
-                staff_spaces = ((octave_count * 7) * -1) + staff_spaces
-                y_note = (upper_staff_top + upper_staff_height + upper_staff_height / 4) - staff_spaces * spacing_bass
-
-            painter.setBrush(defaults.STAFF_MAIN_COLOR)
-            painter.setPen(defaults.STAFF_MAIN_COLOR)
-
-            if midi >= 60:
-                if y_note < upper_staff_top:
-                    num_ledgers = int((upper_staff_top - y_note) / (upper_staff_height / 4))
-                    for i in range(num_ledgers):
-                        ledger_line_y = int(upper_staff_top - (i + 1) * (upper_staff_height / 4))
-                        painter.drawLine(int(staff_middle_width - 10), ledger_line_y, int(staff_middle_width + 10), ledger_line_y)
-                elif y_note > upper_staff_top + upper_staff_height:
-                    num_ledgers = int((y_note - (upper_staff_top + upper_staff_height)) / (upper_staff_height / 4))
-                    for i in range(num_ledgers):
-                        ledger_line_y = int(upper_staff_top + upper_staff_height + (i + 1) * (upper_staff_height / 4))
-                        painter.drawLine(int(staff_middle_width - 10), ledger_line_y, int(staff_middle_width + 10), ledger_line_y)
-            else:
-                if y_note < f_staff_top:
-                    num_ledgers = int((f_staff_top - y_note) / (f_staff_height / 4))
-                    for i in range(num_ledgers):
-                        ledger_line_y = int(f_staff_top - (i + 1) * (f_staff_height / 4))
-                        painter.drawLine(int(staff_middle_width - 10), ledger_line_y, int(staff_middle_width + 10), ledger_line_y)
-                elif y_note > f_staff_top + f_staff_height:
-                    num_ledgers = int((y_note - (f_staff_top + f_staff_height)) / (f_staff_height / 4))
-                    for i in range(num_ledgers):
-                        ledger_line_y = int(f_staff_top + f_staff_height + (i + 1) * (f_staff_height / 4))
-                        painter.drawLine(int(staff_middle_width - 10), ledger_line_y, int(staff_middle_width + 10), ledger_line_y)
-
-            painter.setBrush(defaults.STAFF_NOTE_COLOR)
-            # Draw a rotated note head (ellipse) to simulate a quarter note head rotated to the left
-            painter.save()
-            # Translate to the center of the note head (which is at staff_middle_width, y_note)
-            painter.translate(staff_middle_width, y_note)
-            painter.rotate(-15)  # Rotate 15 degrees to the left
-            # Draw the ellipse centered at (0,0): starting at (-6, -4) yields the correct center
-            painter.drawEllipse(-6, -4, 12, 8)
-            painter.restore()
+            y_note, stem_up, staff_accidental, ledger_ys = staff_note_layout(
+                midi, defaults.global_prefer_sharps, upper_staff_top, upper_staff_height)
+
+            painter.setBrush(self._brush_staff)
+            painter.setPen(self._pen_staff)
+            if ledger_ys:
+                ledger_left = int(staff_middle_width - 10)
+                ledger_right = int(staff_middle_width + 10)
+                painter.drawLines([QLine(ledger_left, y, ledger_right, y) for y in ledger_ys])
+
+            painter.setBrush(self._brush_note)
+            # Draw the rotated note head centered at (staff_middle_width, y_note)
+            painter.drawPath(_NOTE_HEAD_PATH.translated(staff_middle_width, y_note))
 
             # Draw note stem (tail) to appear like a crotchet (quarter note)
-            stem_width = 2
             stem_length = 30  # Adjust this value to change the stem length
-            # Determine the vertical center of the staff
-            if midi >= 60:
-                staff_center = upper_staff_top + upper_staff_height / 2
-            else:
-                staff_center = f_staff_top + f_staff_height / 2
-
-            painter.setPen(QPen(defaults.STAFF_NOTE_COLOR, stem_width))
-            if y_note > staff_center:
+            painter.setPen(self._pen_stem)
+            if stem_up:
                 # Note is below the staff center: draw stem upward from the right side of the note head
                 start_x = int(staff_middle_width + 5)
                 start_y = int(y_note)
@@ -3099,10 +3868,8 @@ class PitchInfoPanel(QWidget):
                 end_y = start_y + stem_length
                 painter.drawLine(start_x, start_y, start_x, end_y)
 
-            painter.setPen(defaults.STAFF_NOTE_COLOR)
-            accidental_font = QFont()
-            accidental_font.setPixelSize(16)
-            painter.setFont(accidental_font)
+            painter.setPen(self._pen_note)
+            painter.setFont(self._font_accidental)
             painter.drawText(int(staff_middle_width - 22), int(y_note + 7), staff_accidental)
 
         painter.end()
@@ -3138,6 +3905,10 @@ class MainWindow(QMainWindow):
             defaults.DEFAULT_WINDOW_HEIGHT
         )
 
+        # Audio error dialog (non-modal; repeated errors are rate limited, see handle_error)
+        self._error_box = None
+        self._last_error_time = float("-inf")
+
         self.initUI()
         self.initAudioWorker()
 
@@ -3188,6 +3959,7 @@ class MainWindow(QMainWindow):
         self.input_source_combo.setMaximumWidth(200)
         self.input_source_combo.view().setMinimumWidth(400)
         self.input_source_combo.setMinimumContentsLength(100)
+        self._device_list_signature = None  # Devices the combo box was last filled from
         self.populate_input_devices()  # This now logs debug messages.
         left_controls.addWidget(self.input_source_combo)
 
@@ -3259,6 +4031,11 @@ class MainWindow(QMainWindow):
         # self.sensitivity_slider.valueChanged.connect(self.change_sensitivity)
         # self.volume_slider.valueChanged.connect(self.change_volume)
         self.pitch_info.scroll_speed_slider.valueChanged.connect(self.change_scroll_speed)
+        # Reopening the stream is slow, so only the last of several quick selections is applied
+        self._pending_device_index = None
+        self._device_change_timer = QTimer(self)
+        self._device_change_timer.setSingleShot(True)
+        self._device_change_timer.timeout.connect(self._apply_input_source_change)
         self.input_source_combo.currentIndexChanged.connect(self.change_input_source)
         self.enharmonic_combo.currentIndexChanged.connect(self.change_enharmonic)
         # self.boost_checkbox.toggled.connect(self.change_boost_mode)
@@ -3266,6 +4043,11 @@ class MainWindow(QMainWindow):
         self.pitch_method_combo.currentIndexChanged.connect(self.change_pitch_method)
         self.root_note_combo.currentIndexChanged.connect(self.change_root_note)
         self.scale_combo.currentIndexChanged.connect(self.change_scale)
+        # Slider drags fire on every step; the worker only receives the latest value of each setting
+        self._pending_worker_settings = {}
+        self._worker_settings_timer = QTimer(self)
+        self._worker_settings_timer.setSingleShot(True)
+        self._worker_settings_timer.timeout.connect(self._apply_worker_settings)
         self.pitch_info.volumeChanged.connect(self.change_volume)
         self.pitch_info.sensitivityChanged.connect(self.change_sensitivity)
         self.note_format_combo.currentIndexChanged.connect(self.change_note_format)
@@ -3278,17 +4060,6 @@ class MainWindow(QMainWindow):
         self.pause_shortcut.setContext(Qt.ShortcutContext.ApplicationShortcut)  # Make it work anywhere in the application
         self.pause_shortcut.activated.connect(self.toggle_pause)
 
-    def log_debug_message(self, message):
-        """
-        Logs a debug message. The message is converted to a string, appended with a newline,
-        printed to the console, and appended to the debug log (if enabled).
-        """
-        msg = str(message)
-        print(msg)
-        if self.debug_log is not None:
-            self.debug_log.append(msg)
-            self.debug_log.moveCursor(QTextCursor.End)
-
     def initAudioWorker(self):
         """
         Initialize and start the audio processing thread (AudioStreamWorker).
@@ -3327,6 +4098,10 @@ class MainWindow(QMainWindow):
             self.audio_worker.vuMeterUpdate.connect(self.piano_roll.update_vu_meter)
             self.audio_worker.vuMeterPostUpdate.connect(self.piano_roll.update_vu_meter_post)
             self.audio_worker.errorOccurred.connect(self.handle_error)
+            # Drain the coalesced pitch/state events and VU levels once per display frame.
+            self.worker_event_timer = QTimer(self)
+            self.worker_event_timer.timeout.connect(self.drain_worker_events)
+            self.worker_event_timer.start(int(1000 / defaults.DEFAULT_PIANO_ROLL_UPDATE_FPS))
             self.audio_worker.start()
 
     def populate_input_devices(self):
@@ -3337,12 +4112,18 @@ class MainWindow(QMainWindow):
         Also logs detailed device and host API information.
         """
         try:
-            devices = sd.query_devices()
-            hostapis = sd.query_hostapis()
+            devices, hostapis = query_audio_devices()
         except Exception as e:
             self.log_debug_message(f"Error querying devices: {e}")
             return
 
+        # Nothing to rebuild if the devices and host APIs are the same as last time
+        signature = (tuple((dev.get("name"), dev.get("hostapi"), dev.get("max_input_channels", 0)) for dev in devices),
+                     tuple(api.get("name", "") for api in hostapis))
+        if signature == self._device_list_signature:
+            return
+        self._device_list_signature = signature
+
         self.log_debug_message("Host APIs:")
         for idx, api in enumerate(hostapis):
             self.log_debug_message(f"  {idx}: {api.get('name', 'Unknown')}")
@@ -3365,45 +4146,51 @@ class MainWindow(QMainWindow):
                 if sd.default.device is not None and isinstance(sd.default.device, (list, tuple)) and len(sd.default.device) > 0:
                     default_device_index = sd.default.device[0]
 
-        found_devices = False
+        # Display tag per host API index, or None if devices on that host API are not listed.
+        # Only ASIO, MME and WASAPI devices are listed (add "WDM-KS" to _LISTED_HOSTAPIS to include it).
+        api_tags = []
+        for api in hostapis:
+            api_name = api.get("name", "").upper()
+            if not any(listed in api_name for listed in _LISTED_HOSTAPIS):
+                api_tags.append(None)
+                continue
+            tag = next((tag for key, tag in _HOSTAPI_TAGS if key in api_name), "")
+            api_tags.append(tag)
+
+        # Collect the (display name, device index) entries first, then fill the combo box in one batch
+        entries = []
+        num_apis = len(api_tags)
         for i, dev in enumerate(devices):
-            if dev.get("max_input_channels", 0) <= 0:
+            # sounddevice always fills these keys; a malformed entry is skipped rather than guessed at
+            try:
+                if dev["max_input_channels"] <= 0:
+                    continue
+                hostapi_index = dev["hostapi"]
+            except KeyError:
                 continue
-            hostapi_index = dev.get("hostapi", None)
-            if hostapi_index is None or hostapi_index >= len(hostapis):
+            if hostapi_index is None or hostapi_index >= num_apis:
                 continue
-            api_name = hostapis[hostapi_index].get("name", "").upper()
-
-
-            #if "ASIO" not in api_name and "WASAPI" not in api_name: continue
-            #if "MME" not in api_name: continue
-            if \
-                "ASIO" not in api_name and \
-                "MME" not in api_name and \
-                "WASAPI" not in api_name: continue
-                #"WDM-KS" not in api_name and \
-
-            if "ASIO" in api_name:
-                device_name = f"[ASIO] {dev.get('name', f'Device {i}')}"
-            elif "WASAPI" in api_name:
-                device_name = f"[WASAPI] {dev.get('name', f'Device {i}')}"
-            elif "WDM-KS" in api_name:
-                device_name = f"[WDM-KS] {dev.get('name', f'Device {i}')}"
-            elif "MME" in api_name:
-                device_name = f"[MME] {dev.get('name', f'Device {i}')}"
-            else:
-                device_name = f"{dev.get('name', f'Device {i}')}"
-
-            self.input_source_combo.addItem(device_name, i)
-            found_devices = True
+            tag = api_tags[hostapi_index]
+            if tag is None:
+                continue
+            entries.append((tag + (dev["name"] if "name" in dev else f"Device {i}"), i))
             #self.log_debug_message(f"  {i}: {device_name}")
 
-        if not found_devices:
+        combo = self.input_source_combo
+        combo.blockSignals(True)
+        combo.addItems([name for name, _ in entries])
+        row_by_device = {}
+        for row, (_, device_index) in enumerate(entries):
+            combo.setItemData(row, device_index)
+            row_by_device[device_index] = row
+        combo.blockSignals(False)
+
+        if not entries:
             self.input_source_combo.addItem("No ASIO/WASAPI input devices found", -1)
             self.log_debug_message("No ASIO/WASAPI input devices found.")
 
         elif default_device_index is not None:
-            idx = self.input_source_combo.findData(default_device_index)
+            idx = row_by_device.get(default_device_index, -1)
             if idx >= 0:
                 self.input_source_combo.setCurrentIndex(idx)
                 self.log_debug_message(f"Default device set to index: {default_device_index}")
@@ -3413,6 +4200,8 @@ class MainWindow(QMainWindow):
         Handle changes to the pitch detection method.
         """
         method = self.pitch_method_combo.currentText()
+        if method == defaults.current_pitch_method and getattr(self.audio_worker, "pitch_method", None) == method:
+            return
         defaults.current_pitch_method = method
         self.audio_worker.set_pitch_method(method)
         self.log_debug_message(f"Pitch method changed to: {method}")
@@ -3435,12 +4224,33 @@ class MainWindow(QMainWindow):
     def change_sensitivity(self, value):
         # Update default sensitivity so changes persist in config file
         defaults.DEFAULT_SENSITIVITY = value
-        self.audio_worker.set_sensitivity(value)
+        self._schedule_worker_setting("set_sensitivity", value)
 
     def change_volume(self, value):
         # Update default volume so changes persist in config file
         defaults.DEFAULT_VOLUME_DB = value
-        self.audio_worker.set_volume_db(value)
+        self._schedule_worker_setting("set_volume_db", value)
+
+    def _schedule_worker_setting(self, setter, value):
+        """
+        Queue a setting for the audio worker, replacing any value of it not yet applied.
+
+        Args:
+            setter (str): Name of the AudioStreamWorker setter to call.
+            value: The value to pass to it.
+        """
+        self._pending_worker_settings[setter] = value
+        if not self._worker_settings_timer.isActive():
+            self._worker_settings_timer.start(defaults.SLIDER_APPLY_DELAY_MS)
+
+    def _apply_worker_settings(self):
+        """
+        Apply the latest queued value of each slider setting to the audio worker.
+        """
+        pending = self._pending_worker_settings
+        self._pending_worker_settings = {}
+        for setter, value in pending.items():
+            getattr(self.audio_worker, setter)(value)
 
     def change_scroll_speed(self, value):
         # Update default scroll speed so changes persist in config file
@@ -3449,9 +4259,17 @@ class MainWindow(QMainWindow):
 
     def change_input_source(self, index):
         """
-        Handle changes in the selected input audio device.
+        Handle changes in the selected input audio device. The stream is reopened by
+        _apply_input_source_change once the selection has settled for INPUT_DEVICE_CHANGE_DELAY_MS.
+        """
+        self._pending_device_index = self.input_source_combo.itemData(index)
+        self._device_change_timer.start(defaults.INPUT_DEVICE_CHANGE_DELAY_MS)
+
+    def _apply_input_source_change(self):
+        """
+        Reopen the audio stream on the most recently selected input device.
         """
-        device_index = self.input_source_combo.itemData(index)
+        device_index = self._pending_device_index
         self.log_debug_message(f"Changing input device to index: {device_index}")
         try:
             # Create a new callback handler on the main thread.
@@ -3471,7 +4289,11 @@ class MainWindow(QMainWindow):
         """
         Handle changes to the enharmonic notation style (sharps/flats).
         """
-        defaults.global_prefer_sharps = (self.enharmonic_combo.currentText() == "Sharps")
+        prefer_sharps = (self.enharmonic_combo.currentText() == "Sharps")
+        if prefer_sharps == defaults.global_prefer_sharps:
+            return
+        defaults.global_prefer_sharps = prefer_sharps
+        defaults.rebuild_scale_cache()
 
     def change_boost_mode(self, checked):
         """
@@ -3489,7 +4311,11 @@ class MainWindow(QMainWindow):
         """
         Update the root note used for scale highlighting.
         """
-        defaults.current_root_note = self.root_note_combo.currentText()
+        root_note = self.root_note_combo.currentText()
+        if root_note == defaults.current_root_note:
+            return
+        defaults.current_root_note = root_note
+        defaults.rebuild_scale_cache()
         # Update any UI elements that show the scale
         self.update_scale_display()
     
@@ -3497,7 +4323,11 @@ class MainWindow(QMainWindow):
         """
         Update the scale/mode used for highlighting the piano roll.
         """
-        defaults.current_scale = self.scale_combo.currentText()
+        scale = self.scale_combo.currentText()
+        if scale == defaults.current_scale:
+            return
+        defaults.current_scale = scale
+        defaults.rebuild_scale_cache()
         # Update any UI elements that show the scale
         self.update_scale_display()
     
@@ -3507,8 +4337,9 @@ class MainWindow(QMainWindow):
             self.log_debug_message("Scale display: No scale selected")
             return
 
-        scale_notes = defaults.generate_scale()
-        scale_solfege = defaults.generate_scale(with_solfege=True)
+        # The scale was just rebuilt by rebuild_scale_cache(); reuse it instead of generating it twice more
+        scale_notes = defaults._scale_notes
+        scale_solfege = [note_to_solfege(n) for n in scale_notes]
 
         root_note = defaults.current_root_note
         scale_type = defaults.current_scale
@@ -3523,7 +4354,7 @@ class MainWindow(QMainWindow):
         """
         self.audio_worker.auto_pause_enabled = checked
 
-    def handle_pitch_detected(self, effective_time, pitch, rms):
+    def handle_pitch_detected(self, effective_time, pitch, rms, update_panel=True):
         """
         Slot to handle detected pitch events.
 
@@ -3531,19 +4362,51 @@ class MainWindow(QMainWindow):
             effective_time (float): The time at which the pitch was detected.
             pitch (float): The detected pitch frequency.
             rms (float): The post-gain RMS level.
+            update_panel (bool): Whether to refresh the pitch panel (drain_worker_events does that
+                                 once per tick for the most recent pitch instead).
         """
+        piano_roll = self.piano_roll
         if pitch > 0:
             full_note, note_no_octave, midi, cents = frequency_to_note(pitch, defaults.global_prefer_sharps)
-            self.pitch_info.update_pitch(full_note, pitch, cents)
-            self.piano_roll.add_pitch_point(effective_time, pitch, note_no_octave, cents)
+            if update_panel:
+                self.pitch_info.update_pitch(full_note, pitch, cents)
+            piano_roll.add_pitch_point(effective_time, pitch, note_no_octave, cents)
         elif pitch == -1.0:
-            self.piano_roll.add_break_point(effective_time)
+            piano_roll.add_break_point(effective_time)
         else:
             # Only update piano roll's latest time if auto pause is NOT enabled.
             if not self.audio_worker.auto_pause_enabled:
-                if effective_time > self.piano_roll.latest_time:
-                    self.piano_roll.latest_time = effective_time
-                self.piano_roll.update()
+                piano_roll.advance_time(effective_time)
+
+    def drain_worker_events(self):
+        """
+        Processes, in order, all pitch and state events queued by the audio worker since the last tick,
+        then applies the latest VU meter levels. Every pitch goes to the piano roll, but the pitch panel
+        is only refreshed once, with the most recent detected pitch, since it just shows the current note.
+        """
+        levels = getattr(self.audio_worker, "vu_levels", None)
+        if levels is not None:
+            self.audio_worker.vu_levels = None
+            self.piano_roll.update_vu_meter(levels[0])
+            self.piano_roll.update_vu_meter_post(levels[1])
+        queue = getattr(self.audio_worker, "event_queue", None)
+        if not queue:
+            return
+        panel_pitch = 0.0
+        popleft = queue.popleft
+        handle_pitch = self.handle_pitch_detected
+        handle_state = self.handle_state_changed
+        for _ in range(len(queue)):
+            event = popleft()
+            if event[0] == "pitch":
+                handle_pitch(event[1], event[2], event[3], False)
+                if event[2] > 0:
+                    panel_pitch = event[2]
+            else:
+                handle_state(event[1], event[2])
+        if panel_pitch > 0:
+            full_note, _, _, cents = frequency_to_note(panel_pitch, defaults.global_prefer_sharps)
+            self.pitch_info.update_pitch(full_note, panel_pitch, cents)
 
     def handle_state_changed(self, time_stamp, paused):
         # time_stamp (float): The effective time of the state change.
@@ -3554,19 +4417,32 @@ class MainWindow(QMainWindow):
 
     def handle_error(self, error_message):
         """
-        Display error messages received from the audio worker in a dialog.
+        Display error messages received from the audio worker in a dialog. Errors that arrive while
+        the dialog is still open, or within AUDIO_ERROR_DIALOG_INTERVAL_S of it, are only printed.
         """
         print("Audio Worker Error:", error_message)
-        QMessageBox.critical(self, "Audio Error", f"An error occurred while opening the audio stream:\n\n{error_message}")
+        now = time.monotonic()
+        if self._error_box is not None and self._error_box.isVisible():
+            return
+        if now - self._last_error_time < defaults.AUDIO_ERROR_DIALOG_INTERVAL_S:
+            return
+        self._last_error_time = now
+        # One reusable non-modal dialog, so a failing device cannot stack dialogs and block the event loop
+        if self._error_box is None:
+            self._error_box = QMessageBox(QMessageBox.Critical, "Audio Error", "", QMessageBox.Ok, self)
+            self._error_box.setModal(False)
+        self._error_box.setText(f"An error occurred while opening the audio stream:\n\n{error_message}")
+        self._error_box.show()
 
     def closeEvent(self, event):
         """
         Ensure proper shutdown by stopping the audio processing thread and saving window geometry.
         """
+        self._device_change_timer.stop()  # Don't reopen a stream for a selection still pending
         self.audio_worker.stop()
         try:
             defaults.updateWindowGeometry(self)
-            defaults.SaveConfigToFile()
+            defaults.SaveConfigToFile(background=True)
         except Exception as e:
             print(f"Error saving configuration: {e}")
         event.accept()
@@ -3584,12 +4460,15 @@ class MainWindow(QMainWindow):
         If 'Natural' is selected, use natural (letter) notation.
         """
         format_choice = self.note_format_combo.currentText()
+        label_flags = (defaults.PITCH_LABEL_SOLFEGE, defaults.PITCH_LABEL_LETTERS)
         if format_choice == "Solfege":
             defaults.PITCH_LABEL_SOLFEGE = True
             defaults.PITCH_LABEL_LETTERS = False
         elif format_choice == "Natural Notes":
             defaults.PITCH_LABEL_SOLFEGE = False
             defaults.PITCH_LABEL_LETTERS = True
+        if (defaults.PITCH_LABEL_SOLFEGE, defaults.PITCH_LABEL_LETTERS) == label_flags:
+            return
 
         # Force an update of UI components so that changes are reflected immediately.
         self.piano_roll.update()
@@ -3616,8 +4495,9 @@ if __name__ == '__main__':
 
     exit_code = app.exec()
     try:
+        # Written from the ConfigWriter thread; it is not a daemon, so the interpreter still waits for it
         defaults.updateWindowGeometry(window)
-        defaults.SaveConfigToFile()
+        defaults.SaveConfigToFile(background=True)
     except Exception as e:
         print(f"Error during exit configuration save: {e}")
     sys.exit(exit_code)